@@ -0,0 +1,145 @@
+"""
+gunicorn 운영 서버 설정.
+
+    gunicorn -c config/gunicorn.conf.py
+
+- preload_app: 마스터가 앱(및 임베딩 모델)을 한 번만 로드한 뒤 워커를 fork 하므로
+  모델 메모리를 copy-on-write 로 공유합니다.
+- 배포 시에는 HUP 대신 USR2 -> (기존 마스터) TERM 순서로 무중단 교체합니다. (deploy.sh 참고)
+  preload_app 모드에서는 HUP 으로 새 코드가 반영되지 않습니다.
+  HUP 은 임베딩 모델 교체에 씁니다. (on_reload: 마스터가 새 버전을 로드한 뒤 워커를 다시 fork)
+- max_requests: 워커가 지정한 요청 수를 처리하면 graceful 하게 재시작됩니다.
+- ASGI 로 띄우려면 GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker,
+  GUNICORN_APP=config.asgi:application, KKOMANTLE_ASYNC_GUESS=true 를 .env.production 에 함께 설정하고
+  FORCE_RESTART=1 ./deploy.sh 로 재시작합니다. (WSGI <-> ASGI 전환은 USR2 대신 재시작)
+"""
+
+import gc
+import multiprocessing
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_env_file(path):
+    """
+    USR2 로 띄운 새 마스터는 처음 시작할 때의 argv 와 환경변수(env_orig)를 그대로 물려받습니다.
+    배포에서 바뀐 .env.production 이 반영되도록 설정 파일을 읽을 때마다 다시 불러옵니다. (파일 값이 우선)
+    파일에서 지운 변수는 지워지지 않으므로 완전히 재시작해야 합니다. (FORCE_RESTART=1 ./deploy.sh)
+    """
+    if not os.path.exists(path):
+        return
+    with open(path) as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            key = key.strip()
+            if key.startswith('export '):
+                key = key[len('export '):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            os.environ[key] = value
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+_load_env_file(os.getenv('ENV_FILE') or os.path.join(BASE_DIR, '.env.production'))
+
+# 앱 경로도 argv 대신 여기서 정해야 USR2 재시작 때 GUNICORN_APP 변경이 반영됩니다.
+wsgi_app = os.getenv('GUNICORN_APP', 'config.wsgi:application')
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:4000')
+workers = _env_int('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+threads = _env_int('GUNICORN_THREADS', 1)
+
+preload_app = True
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# 0 이면 워커 재시작 비활성화
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+pidfile = os.getenv('GUNICORN_PIDFILE', 'gunicorn.pid')
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+proc_name = os.getenv('GUNICORN_PROC_NAME', 'lbplate')
+
+
+def when_ready(server):
+    """워커를 fork 하기 직전(마스터)에 URLConf를 불러와 core.views의 모델 로딩을 끝냅니다."""
+    if not server.cfg.preload_app:
+        return
+
+    from django.urls import get_resolver
+
+    from core import metrics
+
+    get_resolver().url_patterns
+    metrics.reset_multiproc_dir()
+    # 마스터의 모델 로드 지표는 마스터 파일 하나로만 남깁니다. (워커는 post_fork 에서 비움)
+    metrics.flush(force=True)
+    # 이후 생성되는 객체만 GC 대상이 되도록 고정해, 워커에서 GC가 공유 페이지를 건드리지 않게 합니다.
+    gc.freeze()
+    server.log.info("URLConf and embedding model preloaded in master (pid %s)", os.getpid())
+
+
+def post_fork(server, worker):
+    """
+    마스터에서 물려받은 누적 지표를 비우고, 모델 교체는 마스터가 맡으므로
+    워커에서는 매니페스트 감시 스레드를 띄우지 않습니다.
+    """
+    from core import embeddings, metrics
+
+    metrics.reset_inherited()
+    if server.cfg.preload_app:
+        embeddings.registry.watch_manifest = False
+
+
+def on_reload(server):
+    """
+    HUP(manage.py swap_model 이 보냄): 새 워커를 fork 하기 전에 마스터에서 매니페스트의 새 버전을 로드합니다.
+    이후 뜨는 워커(max_requests 재시작 포함)가 모두 새 버전을 copy-on-write 로 공유합니다.
+    로드하는 동안 기존 워커는 계속 요청을 처리합니다.
+    """
+    if not server.cfg.preload_app:
+        return
+
+    from core import embeddings, metrics
+
+    try:
+        version = embeddings.registry.check_manifest()
+    except Exception:
+        server.log.exception("Embedding model swap failed in master; keeping the current version")
+        return
+    if version is not None:
+        metrics.flush(force=True)
+        gc.freeze()
+        server.log.info("Embedding model %s loaded in master (pid %s)", version.name, os.getpid())
+
+
+def worker_exit(server, worker):
+    """종료 직전 워커의 지표와 아직 저장하지 않은 꼬맨틀 통계를 남깁니다."""
+    from core import metrics, stats
+
+    metrics.flush(force=True)
+    try:
+        stats.flush()
+    except Exception:
+        server.log.exception("Failed to flush kkomantle stats on worker exit")
+
+
+def child_exit(server, worker):
+    """종료된 워커의 지표 파일을 누적 파일(archive.json)로 합칩니다."""
+    from core import metrics
+
+    metrics.mark_process_dead(worker.pid)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -97,7 +98,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.WhiteNoiseMiddleware',
+    'core.metrics.MetricsMiddleware',
+    'core.log.RequestLogMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -137,6 +141,24 @@ DATABASES = {
     }
 }
 
+# Cache
+# gunicorn 처럼 워커가 여러 개인 운영 환경에서는 rate limit 등이 워커 간에 공유되도록
+# FileBasedCache 같은 공유 백엔드를 지정하세요. (기본값 LocMemCache는 프로세스별)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', ''),
+    },
+    # 블로그 화면/압축본 전용. 본문이 커서 default 에 두면 속도 제한 카운터 등을 밀어냅니다.
+    'pages': {
+        'BACKEND': os.getenv('DJANGO_PAGE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('DJANGO_PAGE_CACHE_LOCATION', 'lbplate-pages'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DJANGO_PAGE_CACHE_MAX_ENTRIES', '500'))},
+    },
+}
+PAGE_CACHE_ALIAS = 'pages'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -184,8 +206,15 @@ SITE_ID = 1
 
 WORD2VEC_MODEL_PATH = os.path.join(BASE_DIR, 'models', 'cc.ko.300.vec')
 WORD2VEC_LIMIT = 300000
+# 모델 교체용 매니페스트(JSON). 파일이 바뀌면 워커가 새 모델을 백그라운드에서 읽어 교체 (manage.py swap_model)
+WORD2VEC_MODEL_MANIFEST = os.getenv('WORD2VEC_MODEL_MANIFEST', '')
+WORD2VEC_MANIFEST_POLL_INTERVAL = int(os.getenv('WORD2VEC_MANIFEST_POLL_INTERVAL', '10'))
 WP_REQUEST_TIMEOUT = int(os.getenv('WP_REQUEST_TIMEOUT', '5'))
 WP_BASE_URL = os.getenv('WP_BASE_URL', 'http://127.0.0.1:4080/wp-json/wp/v2')
+# 연속 실패가 이 횟수에 도달하면 WordPress 호출을 즉시 실패 처리 (0 이면 비활성화)
+WP_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('WP_CIRCUIT_FAILURE_THRESHOLD', '5'))
+# 서킷이 열린 동안 백그라운드에서 복구를 확인하는 주기(초)
+WP_CIRCUIT_RESET_TIMEOUT = int(os.getenv('WP_CIRCUIT_RESET_TIMEOUT', '30'))
 MAX_2048_SCORE = int(os.getenv('MAX_2048_SCORE', '2000000'))
 MIN_REACTION_SCORE = int(os.getenv('MIN_REACTION_SCORE', '50'))
 MAX_REACTION_SCORE = int(os.getenv('MAX_REACTION_SCORE', '3000'))
@@ -195,11 +224,72 @@ KKOMANTLE_POST_RATE_LIMIT = int(os.getenv('KKOMANTLE_POST_RATE_LIMIT', '45'))
 KKOMANTLE_POST_RATE_WINDOW = int(os.getenv('KKOMANTLE_POST_RATE_WINDOW', '60'))
 KKOMANTLE_MAX_WORD_LENGTH = int(os.getenv('KKOMANTLE_MAX_WORD_LENGTH', '30'))
 KKOMANTLE_WORD_REGEX = os.getenv('KKOMANTLE_WORD_REGEX', r'^[0-9A-Za-z가-힣_]+$')
+# 꼬맨틀 일일 통계를 메모리에서 DB 로 합치는 주기(초). 0 이면 백그라운드 저장을 끕니다.
+KKOMANTLE_STATS_FLUSH_INTERVAL = int(os.getenv('KKOMANTLE_STATS_FLUSH_INTERVAL', '30'))
+# ASGI(uvicorn 워커)로 띄울 때 꼬맨틀 추측 API 를 async 뷰로 연결합니다.
+KKOMANTLE_ASYNC_GUESS = _env_flag('KKOMANTLE_ASYNC_GUESS', False)
+# async 뷰가 임베딩 계산을 넘기는 스레드 수와 대기열 길이. 가득 차면 503 + Retry-After
+KKOMANTLE_COMPUTE_WORKERS = int(os.getenv('KKOMANTLE_COMPUTE_WORKERS', '4'))
+KKOMANTLE_COMPUTE_QUEUE = int(os.getenv('KKOMANTLE_COMPUTE_QUEUE', '64'))
+KKOMANTLE_RETRY_AFTER = int(os.getenv('KKOMANTLE_RETRY_AFTER', '1'))
+# 룰렛/사다리/게임 로비 같은 공개 화면의 브라우저 캐시 시간(초). 이후에는 ETag 로 재검증
+PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', '300'))
+# 홈/블로그/글 화면을 공유 캐시에 두는 시간(초). 워드프레스 수정은 이만큼 늦게 반영됩니다. 0 이면 끔
+BLOG_PAGE_CACHE_TIMEOUT = int(os.getenv('BLOG_PAGE_CACHE_TIMEOUT', '60'))
+# 이보다 작은 응답은 압축하지 않음(바이트). 압축본은 ETag 가 같으면 COMPRESS_CACHE_TIMEOUT 초 동안 재사용
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '200'))
+COMPRESS_CACHE_TIMEOUT = int(os.getenv('COMPRESS_CACHE_TIMEOUT', '3600'))
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '5'))
+
+# /metrics (Prometheus) — 토큰이 비어 있으면 엔드포인트를 노출하지 않습니다.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# gunicorn 워커 간 지표 합산용 디렉터리 (비우면 프로세스별 값만 노출)
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+
+# 구조화(JSON) 로그 — 쓰기는 백그라운드 스레드가 담당 (core/log.py)
+# manage.py test 에서는 요청마다 남는 접근 로그로 출력이 넘치지 않게 WARNING 부터만 남깁니다.
+TESTING = sys.argv[1:2] == ['test']
+LOG_LEVEL = os.getenv('DJANGO_LOG_LEVEL', 'WARNING' if TESTING else 'INFO')
+# 비우면 stderr 로 출력 (gunicorn errorlog 와 함께 수집)
+LOG_FILE = os.getenv('DJANGO_LOG_FILE', '')
+# 이 시간(ms) 이상 걸린 요청은 WARNING 으로 기록
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', '1000'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'request_context': {'()': 'core.log.RequestContextFilter'},
+        # 같은 메시지는 60초에 5번까지만 (WordPress 장애 시 로그 폭주 방지)
+        'dedupe': {
+            '()': 'core.log.DuplicateFilter',
+            'window': int(os.getenv('LOG_DEDUPE_WINDOW', '60')),
+            'burst': int(os.getenv('LOG_DEDUPE_BURST', '5')),
+        },
+    },
+    'handlers': {
+        'background': {
+            '()': 'core.log.BackgroundQueueHandler',
+            'filename': LOG_FILE or None,
+            'filters': ['request_context', 'dedupe'],
+        },
+    },
+    'loggers': {
+        'core': {'handlers': ['background'], 'level': LOG_LEVEL, 'propagate': False},
+        # 500 트레이스백 등 (django.request 는 여기로 전파)
+        'django': {'handlers': ['background'], 'level': 'WARNING', 'propagate': False},
+    },
+}
 
 
 # 2. 정적 파일 모으는 곳 (항상 설정되어 있어야 함!)
 # ★ 중요: if 문 밖으로 뺐습니다.
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# 3. Whitenoise 압축 설정 (배포 시 속도 향상)
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+# 3. Whitenoise 설정 (배포 시 속도 향상)
+# 파일명에 콘텐츠 해시를 붙이고(manifest) gzip/brotli 압축본을 미리 만들어 둡니다.
+# 해시된 파일은 WhiteNoise가 'max-age=315360000, public, immutable' 로 서빙합니다.
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# 해시 없는 원본 경로로 요청되는 파일의 캐시 시간(초)
+WHITENOISE_MAX_AGE = 0 if DEBUG else int(os.getenv('WHITENOISE_MAX_AGE', '3600'))
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import admin
 from django.http import HttpResponse
 from django.urls import path, reverse # reverse 추가
@@ -6,8 +7,10 @@ from django.contrib import sitemaps
 from core.views import (
     home, blog_home, roulette, post_detail, ladder, 
     game_2048, api_2048_rank, games_lobby, 
-    game_reaction, api_reaction_rank, game_wordle, api_wordle_rank, game_kkomantle, api_kkomantle_guess
+    game_reaction, api_reaction_rank, game_wordle, api_wordle_rank, game_kkomantle, api_kkomantle_guess,
+    api_kkomantle_guess_async, api_kkomantle_neighbours, api_kkomantle_stats
 )
+from core.metrics import metrics_view
 
 # 1. robots.txt 설정
 def robots_txt(request):
@@ -41,6 +44,9 @@ sitemaps_dict = {
 }
 
 # 3. URL 패턴
+# ASGI 로 띄운 경우에만 async 뷰를 씁니다. (WSGI 에서는 async 뷰가 요청마다 이벤트 루프를 새로 만듦)
+kkomantle_guess_view = api_kkomantle_guess_async if settings.KKOMANTLE_ASYNC_GUESS else api_kkomantle_guess
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', home, name='home'),
@@ -56,9 +62,14 @@ urlpatterns = [
     path('games/wordle/', game_wordle, name='game_wordle'),
     path('api/rank/wordle/', api_wordle_rank, name='api_wordle_rank'),
     path('games/kkomantle/', game_kkomantle, name='game_kkomantle'),
-    path('api/guess/kkomantle/', api_kkomantle_guess, name='api_kkomantle_guess'),
+    path('api/guess/kkomantle/', kkomantle_guess_view, name='api_kkomantle_guess'),
+    path('api/kkomantle/neighbours/', api_kkomantle_neighbours, name='api_kkomantle_neighbours'),
+    path('api/kkomantle/stats/', api_kkomantle_stats, name='api_kkomantle_stats'),
     
     # robots.txt와 sitemap.xml 경로 추가
+    # Prometheus 지표 (METRICS_TOKEN 필요)
+    path('metrics', metrics_view, name='metrics'),
+
     path("robots.txt", robots_txt),
     path('sitemap.xml', sitemap, {'sitemaps': sitemaps_dict}, name='django.contrib.sitemaps.views.sitemap'),
     
@@ -0,0 +1,125 @@
+"""
+외부 의존성(WordPress 등)용 서킷 브레이커.
+
+연속 실패가 임계치를 넘으면 OPEN 상태가 되어 호출을 즉시 CircuitOpenError 로 실패시킵니다.
+OPEN 동안에는 백그라운드 스레드가 reset_timeout 마다 probe 를 실행(HALF_OPEN)하고,
+성공하면 CLOSED 로 돌아옵니다. 요청 스레드는 복구 확인을 기다리지 않습니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+from . import metrics
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+# /metrics 게이지 값 (여러 워커를 합칠 때 최댓값 = 가장 나쁜 상태)
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(requests.RequestException):
+    """서킷이 열려 있어 호출하지 않고 바로 실패한 경우"""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, probe=None, is_failure=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.is_failure = is_failure or (lambda exc: True)
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._prober = None
+        metrics.set_gauge('lbplate_circuit_state', STATE_VALUES[CLOSED], circuit=name)
+
+    @contextmanager
+    def guard(self):
+        """
+        with breaker.guard():
+            ...외부 호출...
+        OPEN/HALF_OPEN 이면 즉시 CircuitOpenError, 블록 예외는 is_failure 기준으로 실패 집계.
+        """
+        if self.threshold_disabled:
+            yield
+            return
+
+        if self.state != CLOSED:
+            metrics.inc('lbplate_circuit_rejections_total', circuit=self.name)
+            raise CircuitOpenError(f"{self.name} circuit is {self.state}")
+
+        try:
+            yield
+        except Exception as exc:
+            if self.is_failure(exc):
+                self.record_failure()
+            raise
+        else:
+            self.record_success()
+
+    @property
+    def threshold_disabled(self):
+        return self.failure_threshold <= 0
+
+    def record_success(self):
+        if self.failures:
+            with self.lock:
+                self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state != CLOSED or self.failures < self.failure_threshold:
+                return
+            self._transition(OPEN)
+            self.opened_at = time.monotonic()
+            self._start_prober()
+
+    def reset(self):
+        with self.lock:
+            self.failures = 0
+            self._transition(CLOSED)
+
+    def _transition(self, state):
+        # self.lock 을 잡은 상태에서 호출합니다.
+        if self.state == state:
+            return
+        self.state = state
+        metrics.set_gauge('lbplate_circuit_state', STATE_VALUES[state], circuit=self.name)
+        metrics.inc('lbplate_circuit_transitions_total', circuit=self.name, state=state)
+
+    def _start_prober(self):
+        if self._prober is not None and self._prober.is_alive():
+            return
+        self._prober = threading.Thread(target=self._probe_loop, name=f'{self.name}-circuit-probe', daemon=True)
+        self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.reset_timeout)
+            with self.lock:
+                if self.state == CLOSED:
+                    return
+                self._transition(HALF_OPEN)
+
+            try:
+                healthy = self.probe() if self.probe else True
+            except Exception:
+                healthy = False
+
+            with self.lock:
+                if self.state != HALF_OPEN:
+                    return
+                if healthy:
+                    self.failures = 0
+                    self._transition(CLOSED)
+                    return
+                self._transition(OPEN)
+                self.opened_at = time.monotonic()
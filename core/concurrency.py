@@ -0,0 +1,53 @@
+"""
+async 뷰에서 CPU 작업(임베딩 계산)을 넘기는 크기 제한 스레드 풀.
+
+실행 중 + 대기 작업 수가 max_workers + max_pending 에 도달하면 기다리지 않고 Saturated 를 던집니다.
+뷰는 이때 503 + Retry-After 로 응답해서, 이벤트 루프 뒤에 작업이 끝없이 쌓이지 않게 합니다.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+
+
+class Saturated(Exception):
+    """풀이 가득 차서 작업을 받지 않은 경우"""
+
+
+class BoundedExecutor:
+    def __init__(self, name, max_workers=4, max_pending=64):
+        self.name = name
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self.lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        if self._pid != os.getpid():
+            with self.lock:
+                if self._pid != os.getpid():
+                    # fork 된 워커에는 부모의 스레드가 없으므로 풀을 새로 만듭니다.
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f'{self.name}-worker')
+                    self._pid = os.getpid()
+        return self._executor
+
+    async def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            metrics.inc('lbplate_executor_rejections_total', executor=self.name)
+            raise Saturated(self.name)
+        try:
+            # 요청 컨텍스트(구간 시간, 로그 request_id)를 작업 스레드로 넘깁니다.
+            context = contextvars.copy_context()
+            future = self._get_executor().submit(context.run, func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        # 클라이언트가 끊겨 await 가 취소돼도 슬롯은 작업이 끝날 때 반환됩니다.
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
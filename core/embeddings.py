@@ -0,0 +1,195 @@
+"""
+임베딩 모델 레지스트리.
+
+- ModelVersion: 로드된 KeyedVectors + 정답 후보 목록 + 로드 시간/메모리.
+- registry.current(): 요청에서 쓸 활성 버전. 참조 하나만 바꾸므로 교체가 원자적이고,
+  요청 도중 교체되어도 이미 잡은 버전은 끝까지 그대로 씁니다.
+- WORD2VEC_MODEL_MANIFEST(JSON: {"name", "path", "limit"})가 바뀌면 새 버전을 로드하고 검증한 뒤
+  교체합니다. 검증에 실패하면 기존 버전을 계속 씁니다. (manage.py swap_model 이 매니페스트를 씁니다.)
+- gunicorn(preload)에서는 마스터가 교체를 맡습니다. swap_model 이 마스터에 HUP 을 보내면
+  on_reload 훅이 마스터에서 새 버전을 로드하고, 새로 fork 된 워커들이 copy-on-write 로 공유합니다.
+  워커의 매니페스트 감시(watch_manifest)는 꺼서 워커마다 따로 로드하지 않습니다.
+- 그 밖의 실행 방식(runserver, 단일 프로세스)에서는 백그라운드 스레드가 매니페스트를 감시합니다.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from gensim.models import KeyedVectors
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ModelValidationError(Exception):
+    """새 버전이 검증을 통과하지 못해 교체하지 않은 경우"""
+
+
+def build_candidates(model):
+    # 상위 3000개 중 2글자 이상, 한글로만 된 단어 필터링
+    raw_candidates = model.index_to_key[:3000]
+    return [w for w in raw_candidates if len(w) >= 2 and w.replace('_', '').isalpha()]
+
+
+def model_memory_bytes(model):
+    total = model.vectors.nbytes
+    norms = getattr(model, 'norms', None)
+    if norms is not None:
+        total += norms.nbytes
+    return total
+
+
+def read_model_file(path, limit=None):
+    if path.endswith('.kv'):
+        # gensim 기본 형식은 mmap 으로 열어 워커끼리 페이지 캐시를 공유합니다.
+        return KeyedVectors.load(path, mmap='r')
+    return KeyedVectors.load_word2vec_format(path, binary=path.endswith('.bin'), limit=limit)
+
+
+class ModelVersion:
+    def __init__(self, name, model, path=None, load_seconds=0.0):
+        self.name = name
+        self.model = model
+        self.path = path
+        self.load_seconds = load_seconds
+        self.candidates = build_candidates(model)
+        self.memory_bytes = model_memory_bytes(model)
+
+    @classmethod
+    def load(cls, name, path, limit=None):
+        started = time.perf_counter()
+        model = read_model_file(path, limit)
+        # 첫 most_similar 요청이 정규화 비용을 내지 않도록 미리 계산 (preload 시 워커와 공유)
+        model.fill_norms()
+        return cls(name, model, path=path, load_seconds=time.perf_counter() - started)
+
+    def __repr__(self):
+        return f"<ModelVersion {self.name}: {len(self.model.index_to_key)} words>"
+
+
+def validate(version, required_words=()):
+    model = version.model
+    if not version.candidates:
+        raise ModelValidationError(f"{version.name}: 정답 후보 단어가 없습니다.")
+    if not np.isfinite(model.vectors[:1000]).all():
+        raise ModelValidationError(f"{version.name}: 벡터에 NaN/inf 가 있습니다.")
+    missing = [word for word in required_words if word and word not in model.key_to_index]
+    if missing:
+        raise ModelValidationError(f"{version.name}: 오늘의 정답 단어가 사전에 없습니다.")
+    model.most_similar(version.candidates[0], topn=10)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.active = None
+        self.lock = threading.Lock()
+        # 교체 후에도 유지되어야 하는 단어 (views 에서 오늘의 정답을 돌려주도록 설정)
+        self.required_words = lambda: ()
+        # gunicorn 워커에서는 False (마스터가 HUP 때 교체하고 워커를 다시 fork)
+        self.watch_manifest = True
+        self._watcher_pid = None
+        self._manifest_mtime = None
+
+    def current(self):
+        self._ensure_watcher()
+        return self.active
+
+    def activate(self, version, required_words=None):
+        validate(version, self.required_words() if required_words is None else required_words)
+        with self.lock:
+            previous, self.active = self.active, version
+
+        metrics.set_gauge('lbplate_model_load_seconds', version.load_seconds, version=version.name)
+        metrics.set_gauge('lbplate_model_memory_bytes', version.memory_bytes, version=version.name)
+        metrics.set_gauge('lbplate_model_active', 1, version=version.name)
+        if previous is not None and previous.name != version.name:
+            metrics.set_gauge('lbplate_model_active', 0, version=previous.name)
+            metrics.set_gauge('lbplate_model_memory_bytes', 0, version=previous.name)
+        metrics.inc('lbplate_model_swaps_total', version=version.name, outcome='activated')
+        logger.info(
+            "임베딩 모델 활성화: %s", version.name,
+            extra={'previous': previous.name if previous else None, 'load_seconds': round(version.load_seconds, 2),
+                   'memory_bytes': version.memory_bytes, 'words': len(version.model.index_to_key)},
+        )
+        return previous
+
+    def load(self, name, path, limit=None, required_words=None):
+        """파일에서 새 버전을 읽고 검증한 뒤 활성화합니다. (호출한 스레드에서 실행)"""
+        logger.info("임베딩 모델 로딩 중: %s (%s)", name, path)
+        try:
+            version = ModelVersion.load(name, path, limit)
+            self.activate(version, required_words)
+        except Exception:
+            metrics.inc('lbplate_model_swaps_total', version=name, outcome='failed')
+            raise
+        return version
+
+    def load_initial(self, path, limit=None):
+        """서버 시작 시 1회: 매니페스트가 있으면 그 버전을, 없으면 WORD2VEC_MODEL_PATH 를 읽습니다."""
+        spec = self._read_manifest()
+        if spec is None and path and os.path.exists(path):
+            spec = {'name': os.path.basename(path), 'path': path, 'limit': limit}
+        if spec is None:
+            return None
+        # 재시작은 기존 정답을 지킬 필요가 없으므로(없는 단어면 새로 뽑음) 필수 단어 검사를 생략
+        return self.load(spec['name'], spec['path'], spec.get('limit', limit), required_words=())
+
+    def _manifest_path(self):
+        return getattr(settings, 'WORD2VEC_MODEL_MANIFEST', '')
+
+    def _read_manifest(self):
+        manifest = self._manifest_path()
+        if not manifest:
+            return None
+        try:
+            mtime = os.stat(manifest).st_mtime_ns
+            with open(manifest) as manifest_file:
+                spec = json.load(manifest_file)
+        except FileNotFoundError:
+            return None
+        self._manifest_mtime = mtime
+        spec.setdefault('name', os.path.basename(spec['path']))
+        spec.setdefault('limit', getattr(settings, 'WORD2VEC_LIMIT', None))
+        return spec
+
+    def check_manifest(self):
+        """매니페스트가 바뀌었고 활성 버전과 다르면 새 버전을 로드합니다."""
+        manifest = self._manifest_path()
+        try:
+            if not manifest or os.stat(manifest).st_mtime_ns == self._manifest_mtime:
+                return None
+        except FileNotFoundError:
+            return None
+        spec = self._read_manifest()
+        if spec is None or (self.active is not None and self.active.name == spec['name']):
+            return None
+        return self.load(spec['name'], spec['path'], spec['limit'])
+
+    def _ensure_watcher(self):
+        if not self.watch_manifest or self._watcher_pid == os.getpid() or not self._manifest_path():
+            return
+        with self.lock:
+            if self._watcher_pid == os.getpid():
+                return
+            # fork 된 워커마다 감시 스레드를 새로 띄웁니다.
+            thread = threading.Thread(target=self._watch_loop, name='model-manifest-watch', daemon=True)
+            thread.start()
+            self._watcher_pid = os.getpid()
+
+    def _watch_loop(self):
+        interval = getattr(settings, 'WORD2VEC_MANIFEST_POLL_INTERVAL', 10)
+        while True:
+            time.sleep(interval)
+            try:
+                self.check_manifest()
+            except Exception:
+                logger.exception("임베딩 모델 교체 실패")
+
+
+registry = ModelRegistry()
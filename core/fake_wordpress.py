@@ -0,0 +1,175 @@
+"""
+부하 테스트용 가짜 WordPress REST 서버.
+
+실제 WordPress(4080 포트) 대신 /wp-json/wp/v2/ 의 posts, posts/<id>, categories 를
+흉내 내며, 응답 지연·실패율·무응답(hang)을 설정할 수 있습니다.
+사이트는 WP_BASE_URL 을 이 서버의 base_url 로 지정해 실행하면 됩니다.
+"""
+
+import datetime
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = '/wp-json/wp/v2/'
+
+
+class FakeWordPress:
+    def __init__(self, host='127.0.0.1', port=4081, latency_ms=0, jitter_ms=0, failure_rate=0.0,
+                 hang_rate=0.0, hang_seconds=30.0, post_count=40, post_bytes=4000, seed=None):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.categories = [
+            {'id': category_id, 'name': f'Category {category_id}', 'slug': f'category-{category_id}'}
+            for category_id in range(1, 6)
+        ]
+        self.posts = self._build_posts(post_count, post_bytes)
+        self.request_count = 0
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}{API_PREFIX.rstrip('/')}"
+
+    def _build_posts(self, post_count, post_bytes):
+        paragraph = '<p>미생물의 똑똑한 하루 – 부하 테스트용 본문입니다. Lorem ipsum dolor sit amet.</p>\n'
+        content = paragraph * max(1, post_bytes // len(paragraph.encode('utf-8')))
+        started = datetime.datetime(2025, 1, 1)
+        posts = []
+        for post_id in range(1, post_count + 1):
+            category = self.categories[post_id % len(self.categories)]
+            posts.append({
+                'id': post_id,
+                'date': (started + datetime.timedelta(days=post_id)).isoformat(),
+                'title': {'rendered': f'테스트 글 {post_id}'},
+                'excerpt': {'rendered': f'<p>테스트 글 {post_id} 요약</p>'},
+                'content': {'rendered': content},
+                'categories': [category['id']],
+                '_embedded': {'wp:term': [[category]]},
+            })
+        # WordPress 기본 정렬: 최신 글이 먼저
+        posts.reverse()
+        return posts
+
+    def start(self):
+        handler = type('FakeWordPressHandler', (FakeWordPressHandler,), {'fake': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-wordpress', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def next_behaviour(self):
+        """이번 요청에 적용할 (지연 초, 'ok' | 'fail' | 'hang') 을 정합니다."""
+        with self._lock:
+            self.request_count += 1
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.rng.random()
+        if roll < self.hang_rate:
+            return delay, 'hang'
+        if roll < self.hang_rate + self.failure_rate:
+            return delay, 'fail'
+        return delay, 'ok'
+
+    def route(self, path, query):
+        """(status, payload, headers) 를 돌려줍니다."""
+        if not path.startswith(API_PREFIX):
+            return 404, {'code': 'rest_no_route'}, {}
+        resource = path[len(API_PREFIX):].strip('/')
+
+        if resource == 'categories':
+            return 200, self.categories, {'X-WP-Total': str(len(self.categories)), 'X-WP-TotalPages': '1'}
+
+        if resource.startswith('posts/'):
+            try:
+                post_id = int(resource.split('/', 1)[1])
+            except ValueError:
+                return 404, {'code': 'rest_no_route'}, {}
+            for post in self.posts:
+                if post['id'] == post_id:
+                    return 200, post, {}
+            return 404, {'code': 'rest_post_invalid_id'}, {}
+
+        if resource == 'posts':
+            return self._list_posts(query)
+
+        return 404, {'code': 'rest_no_route'}, {}
+
+    def _list_posts(self, query):
+        posts = self.posts
+        if query.get('categories'):
+            category_id = int(query['categories'])
+            posts = [p for p in posts if category_id in p['categories']]
+        if query.get('search'):
+            posts = [p for p in posts if query['search'] in p['title']['rendered']]
+        if query.get('before'):
+            posts = [p for p in posts if p['date'] < query['before']]
+        if query.get('after'):
+            posts = [p for p in posts if p['date'] > query['after']]
+        if query.get('order') == 'asc':
+            posts = list(reversed(posts))
+
+        per_page = max(1, int(query.get('per_page', 10)))
+        page = max(1, int(query.get('page', 1)))
+        total_pages = max(1, -(-len(posts) // per_page))
+        if page > total_pages:
+            return 400, {'code': 'rest_post_invalid_page_number'}, {}
+
+        headers = {'X-WP-Total': str(len(posts)), 'X-WP-TotalPages': str(total_pages)}
+        return 200, posts[(page - 1) * per_page:page * per_page], headers
+
+
+class FakeWordPressHandler(BaseHTTPRequestHandler):
+    fake = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        delay, behaviour = self.fake.next_behaviour()
+        if delay:
+            time.sleep(delay)
+        if behaviour == 'hang':
+            time.sleep(self.fake.hang_seconds)
+
+        if behaviour == 'fail':
+            status, payload, headers = 500, {'code': 'internal_server_error'}, {}
+        else:
+            split = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+            try:
+                status, payload, headers = self.fake.route(split.path, query)
+            except (TypeError, ValueError):
+                status, payload, headers = 400, {'code': 'rest_invalid_param'}, {}
+
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트(사이트)가 타임아웃으로 먼저 끊은 경우
+            pass
+
+    def log_message(self, format, *args):
+        pass
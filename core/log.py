@@ -0,0 +1,227 @@
+"""
+구조화(JSON) 로깅.
+
+- BackgroundQueueHandler: 요청 스레드는 레코드를 큐에 넣기만 하고, 디스크/파이프 쓰기는
+  백그라운드 QueueListener 스레드가 합니다. 큐가 가득 차면 기다리지 않고 버립니다.
+- DuplicateFilter: 같은 메시지가 window 초 안에 burst 회를 넘으면 억제하고,
+  다음 창에서 억제한 횟수(suppressed)를 함께 남깁니다. 요청마다 남는 access 레코드(core.request)는
+  메시지가 모두 같으므로 제외합니다.
+- RequestLogMiddleware: 요청 id/뷰 이름을 로그 컨텍스트에 넣고 요청마다 지연시간과
+  WordPress/DB/임베딩 구간 시간을 담은 access 레코드를 남깁니다.
+"""
+
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+request_logger = logging.getLogger('core.request')
+
+_request_context = contextvars.ContextVar('log_request_context', default=None)
+
+# LogRecord 기본 속성 (이외의 속성은 extra 로 보고 JSON 에 포함)
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_REQUEST_ID_RE = re.compile(r'^[0-9A-Za-z._-]{1,64}$')
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """요청 스레드에서 request_id/view 를 레코드에 붙입니다. (리스너 스레드에서는 컨텍스트가 없음)"""
+
+    def filter(self, record):
+        context = _request_context.get()
+        if context:
+            for key, value in context.items():
+                if not key.startswith('_') and not hasattr(record, key):
+                    setattr(record, key, value)
+            match = getattr(context.get('_request'), 'resolver_match', None)
+            if match is not None and not hasattr(record, 'view'):
+                record.view = match.url_name or match.view_name
+        return True
+
+
+class DuplicateFilter(logging.Filter):
+    def __init__(self, window=60, burst=5, exempt=('core.request',)):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.exempt = frozenset(exempt)
+        self.lock = threading.Lock()
+        self.seen = {}
+
+    def filter(self, record):
+        if record.name in self.exempt:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry else 0
+                self.seen[key] = [now, 1, 0]
+                if len(self.seen) > 1000:
+                    self._prune(now)
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if entry[1] < self.burst:
+                entry[1] += 1
+                return True
+            entry[2] += 1
+            return False
+
+    def _prune(self, now):
+        for key in [k for k, v in self.seen.items() if now - v[0] >= self.window and not v[2]]:
+            del self.seen[key]
+
+
+class BackgroundQueueHandler(QueueHandler):
+    def __init__(self, filename=None, stream=None, max_queue=10000):
+        self.max_queue = max_queue
+        super().__init__(queue.Queue(max_queue))
+        if filename:
+            # logrotate 등으로 파일이 바뀌어도 다시 열도록 WatchedFileHandler 사용
+            target = WatchedFileHandler(filename, encoding='utf-8')
+        else:
+            target = logging.StreamHandler(stream)
+        target.setFormatter(JsonFormatter())
+        self.target = target
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # fork 직후: 부모의 리스너 스레드는 없고 큐의 락 상태도 알 수 없으므로 새로 만듭니다.
+            self.queue = queue.Queue(self.max_queue)
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc('lbplate_log_records_dropped_total')
+
+    def stop(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+class RequestLogMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'SLOW_REQUEST_MS', 1000)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token, request_id = self.start(request)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            self.finish(request, response, request_id, started)
+            return response
+        finally:
+            _request_context.reset(token)
+
+    async def __acall__(self, request):
+        token, request_id = self.start(request)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+            self.finish(request, response, request_id, started)
+            return response
+        finally:
+            _request_context.reset(token)
+
+    def start(self, request):
+        incoming = request.META.get('HTTP_X_REQUEST_ID', '')
+        request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex[:16]
+        # view 는 URL 이 해석된 뒤 RequestContextFilter 가 request.resolver_match 에서 읽습니다.
+        return _request_context.set({'request_id': request_id, '_request': request}), request_id
+
+    def finish(self, request, response, request_id, started):
+        latency_ms = (time.perf_counter() - started) * 1000
+        response['X-Request-ID'] = request_id
+        self.log_request(request, response, latency_ms)
+
+    def log_request(self, request, response, latency_ms):
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'latency_ms': round(latency_ms, 2),
+        }
+        for key, value in (metrics.current_request_timings() or {}).items():
+            if key.endswith('_seconds'):
+                fields[key[:-len('_seconds')] + '_ms'] = round(value * 1000, 2)
+            else:
+                fields[key] = value
+
+        level = logging.WARNING if latency_ms >= self.slow_ms else logging.INFO
+        request_logger.log(level, 'request', extra=fields)
@@ -0,0 +1,260 @@
+import datetime
+import json
+import platform
+import random
+import time
+from unittest.mock import patch
+
+import numpy as np
+import requests
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from gensim.models import KeyedVectors
+
+from core import embeddings, views
+from core.models import GameRecord
+from core.perf import summarize_latencies
+
+BENCHMARKS = (
+    'daily_word',
+    'top1000_cold',
+    'top1000_warm',
+    'guess_scoring',
+    'rate_limit',
+    'leaderboard_2048',
+    'leaderboard_reaction',
+    'leaderboard_wordle',
+    'wp_json_parse',
+)
+
+# 가~힣 완성형 음절로 합성 단어를 만듭니다. (KKOMANTLE_WORD_REGEX / isalpha 통과)
+HANGUL_SYLLABLES = [chr(code) for code in range(0xAC00, 0xD7A4)]
+
+
+def build_synthetic_model(vocab_size, dim, seed):
+    """vocab_size x dim 크기의 무작위 임베딩으로 KeyedVectors를 만듭니다."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < vocab_size:
+        length = rng.choice((2, 2, 3))
+        words.add(''.join(rng.choice(HANGUL_SYLLABLES) for _ in range(length)))
+    words = sorted(words)
+    rng.shuffle(words)
+
+    vectors = np.random.default_rng(seed).standard_normal((vocab_size, dim), dtype=np.float32)
+    synthetic = KeyedVectors(vector_size=dim)
+    synthetic.add_vectors(words, vectors)
+    return synthetic
+
+
+def build_wp_response(post_count, content_bytes):
+    """WordPress /posts 응답과 같은 모양의 requests.Response를 만듭니다."""
+    body = 'lorem ipsum dolor sit amet ' * max(1, content_bytes // 27)
+    posts = [
+        {
+            'id': post_id,
+            'date': '2026-01-01T00:00:00',
+            'title': {'rendered': f'synthetic post {post_id}'},
+            'excerpt': {'rendered': body[:200]},
+            'content': {'rendered': body},
+            'categories': [1],
+            '_embedded': {'wp:term': [[{'id': 1, 'name': 'General'}]]},
+        }
+        for post_id in range(1, post_count + 1)
+    ]
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(posts).encode('utf-8')
+    response.headers['Content-Type'] = 'application/json; charset=UTF-8'
+    response.headers['X-WP-TotalPages'] = '1'
+    return response
+
+
+def measure(func, iterations, warmup, max_seconds):
+    """func를 iterations 번(또는 max_seconds 가 지날 때까지) 실행해 지연시간을 요약합니다."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    started = time.perf_counter()
+    deadline = started + max_seconds
+    for _ in range(iterations):
+        op_started = time.perf_counter()
+        func()
+        op_finished = time.perf_counter()
+        samples.append(op_finished - op_started)
+        if op_finished >= deadline:
+            break
+    return summarize_latencies(samples, time.perf_counter() - started)
+
+
+def find_regressions(results, baseline, tolerance):
+    """baseline 대비 ops/sec 가 tolerance 비율 이상 떨어진 항목을 돌려줍니다."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get('ops_per_sec'):
+            continue
+        floor = previous['ops_per_sec'] * (1 - tolerance)
+        if current['ops_per_sec'] < floor:
+            regressions.append(
+                f"{name}: {current['ops_per_sec']} ops/s < {floor:.2f} "
+                f"(baseline {previous['ops_per_sec']} ops/s, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = '핫 패스(오늘의 단어, 유사도 순위, 추측 채점, rate limit, 랭킹, WP 파싱) 마이크로벤치마크'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vocab', type=int, default=50000, help='합성 임베딩 단어 수')
+        parser.add_argument('--dim', type=int, default=300, help='합성 임베딩 차원')
+        parser.add_argument('--records', type=int, default=5000, help='게임별로 심을 GameRecord 수')
+        parser.add_argument('--iterations', type=int, default=2000, help='벤치마크별 측정 횟수')
+        parser.add_argument('--cold-iterations', type=int, default=10, help='top1000_cold 측정 횟수')
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--max-seconds', type=float, default=10.0, help='벤치마크별 최대 측정 시간(초)')
+        parser.add_argument('--wp-posts', type=int, default=8, help='WP 응답에 담을 글 수')
+        parser.add_argument('--wp-post-bytes', type=int, default=4000, help='WP 글 본문 크기')
+        parser.add_argument('--seed', type=int, default=1234)
+        parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='일부 벤치마크만 실행')
+        parser.add_argument('--output', help='결과를 저장할 JSON 경로')
+        parser.add_argument('--baseline', help='비교할 기준 결과 JSON 경로')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='baseline 대비 허용하는 ops/sec 감소 비율 (기본 0.2 = 20%%)'
+        )
+        parser.add_argument(
+            '--use-current-db', action='store_false', dest='isolated_db',
+            help='임시 테스트 DB를 만들지 않고 현재 DB에 기록을 심습니다 (테스트/일회용 DB 전용)'
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline'], encoding='utf-8') as baseline_file:
+                    baseline = json.load(baseline_file)['results']
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"baseline을 읽을 수 없습니다: {e}")
+
+        old_db_name = None
+        if options['isolated_db']:
+            old_db_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self.run_benchmarks(options)
+        finally:
+            if old_db_name is not None:
+                connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+        report = {
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'vocab': options['vocab'],
+                'dim': options['dim'],
+                'records': options['records'],
+                'iterations': options['iterations'],
+            },
+            'results': results,
+        }
+
+        self.stdout.write(f"{'benchmark':<22}{'ops/sec':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<22}{stats['ops_per_sec']:>12.1f}{stats['p50_ms']:>10.3f}"
+                f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                json.dump(report, output_file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+        if baseline is not None:
+            regressions = find_regressions(results, baseline, options['tolerance'])
+            if regressions:
+                raise CommandError('성능 회귀 감지:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('baseline 대비 회귀 없음'))
+
+    def run_benchmarks(self, options):
+        selected = options['only'] or BENCHMARKS
+        iterations = options['iterations']
+        warmup = options['warmup']
+        rng = random.Random(options['seed'])
+
+        synthetic = build_synthetic_model(options['vocab'], options['dim'], options['seed'])
+        vocab_sample = [rng.choice(synthetic.index_to_key) for _ in range(1024)]
+
+        for game_type, low, high in (('2048', 4, 200000), ('reaction', 50, 3000), ('wordle', 1, 6)):
+            GameRecord.objects.bulk_create(
+                [
+                    GameRecord(game_type=game_type, player_name=f'p{i % 1000}', score=rng.randint(low, high))
+                    for i in range(options['records'])
+                ],
+                batch_size=1000,
+            )
+
+        factory = RequestFactory()
+        guess_requests = [
+            factory.post(
+                '/api/guess/kkomantle/',
+                data=json.dumps({'word': word}),
+                content_type='application/json',
+            )
+            for word in vocab_sample
+        ]
+        rate_limit_requests = [
+            factory.post('/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}') for i in range(1024)
+        ]
+        rank_request = factory.get('/api/rank/')
+        wp_response = build_wp_response(options['wp_posts'], options['wp_post_bytes'])
+
+        def cycle(items):
+            position = [0]
+
+            def next_item():
+                position[0] = (position[0] + 1) % len(items)
+                return items[position[0]]
+            return next_item
+
+        next_guess = cycle(guess_requests)
+        next_rate_limit = cycle(rate_limit_requests)
+
+        def top1000_cold():
+            views.TODAY_CACHE['date'] = None
+            cache.delete(views.NEIGHBOURS_PIN_KEY.format(datetime.date.today().isoformat()))
+            views.get_top1000(views.get_daily_word())
+
+        def top1000_warm():
+            views.get_top1000(views.get_daily_word())
+
+        benches = {
+            'daily_word': (views.get_daily_word, iterations),
+            'top1000_cold': (top1000_cold, options['cold_iterations']),
+            'top1000_warm': (top1000_warm, iterations),
+            'guess_scoring': (lambda: views.api_kkomantle_guess(next_guess()), iterations),
+            'rate_limit': (lambda: views.is_rate_limited(next_rate_limit(), 'bench', 10 ** 9, 60), iterations),
+            'leaderboard_2048': (lambda: views.api_2048_rank(rank_request), iterations),
+            'leaderboard_reaction': (lambda: views.api_reaction_rank(rank_request), iterations),
+            'leaderboard_wordle': (lambda: views.api_wordle_rank(rank_request), iterations),
+            'wp_json_parse': (lambda: views.fetch_wp_json('posts', {'per_page': options['wp_posts']}), iterations),
+        }
+
+        results = {}
+        isolated_cache = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'}}
+        with override_settings(CACHES=isolated_cache, KKOMANTLE_POST_RATE_LIMIT=0, KKOMANTLE_STATS_FLUSH_INTERVAL=0), \
+                patch.object(embeddings.registry, 'active', embeddings.ModelVersion('synthetic', synthetic)), \
+                patch.dict(views.TODAY_CACHE, {'date': None, 'secret': None, 'version': None, 'top1000': [], 'neighbours': {}, 'artifact': None}), \
+                patch.object(views.requests, 'get', return_value=wp_response):
+            for name in BENCHMARKS:
+                if name not in selected:
+                    continue
+                func, count = benches[name]
+                self.stderr.write(f"running {name} ({count} iterations)...")
+                results[name] = measure(func, count, min(warmup, count), options['max_seconds'])
+        return results
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.fake_wordpress import FakeWordPress
+
+
+class Command(BaseCommand):
+    help = '부하 테스트용 가짜 WordPress REST 서버를 실행합니다. (지연/실패율 설정 가능)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=4081)
+        parser.add_argument('--latency-ms', type=float, default=50, help='응답 지연(ms)')
+        parser.add_argument('--jitter-ms', type=float, default=20, help='응답 지연 편차(ms)')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+        parser.add_argument('--hang-rate', type=float, default=0.0, help='응답하지 않는 요청 비율 (0~1)')
+        parser.add_argument('--hang-seconds', type=float, default=30.0)
+        parser.add_argument('--posts', type=int, default=40, help='가짜 글 수')
+        parser.add_argument('--post-bytes', type=int, default=4000, help='글 본문 크기')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        fake = FakeWordPress(
+            host=options['host'],
+            port=options['port'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            failure_rate=options['failure_rate'],
+            hang_rate=options['hang_rate'],
+            hang_seconds=options['hang_seconds'],
+            post_count=options['posts'],
+            post_bytes=options['post_bytes'],
+            seed=options['seed'],
+        ).start()
+
+        self.stdout.write(f"가짜 WordPress 실행 중: {fake.base_url}")
+        self.stdout.write(f"사이트를 WP_BASE_URL={fake.base_url} 로 실행하세요. (종료: Ctrl+C)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            fake.stop()
+            self.stdout.write(f"종료 (처리한 요청 {fake.request_count}건)")
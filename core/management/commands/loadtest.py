@@ -0,0 +1,352 @@
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from core.fake_wordpress import FakeWordPress
+from core.perf import summarize_latencies
+
+ENDPOINTS = ('home', 'blog', 'post', 'guess', 'score', 'rank')
+DEFAULT_MIX = 'home=10,blog=20,post=20,guess=30,score=5,rank=15'
+DEFAULT_WORDS = (
+    '세포', '사랑', '바다', '하늘', '음악', '학교', '친구', '시간', '사람', '생각',
+    '과학', '컴퓨터', '미생물', '단백질', '유전자', '바이러스', '커피', '여행', '도시', '나무',
+)
+RANK_GAMES = ('2048', 'reaction', 'wordle')
+CSRF_TOKEN_RE = re.compile(r'data-csrf-token="([^"]+)"')
+
+
+def parse_mix(raw):
+    weights = {}
+    for item in raw.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise CommandError(f"알 수 없는 엔드포인트: {name} (가능: {', '.join(ENDPOINTS)})")
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            raise CommandError(f"잘못된 가중치: {item}")
+    if not any(weights.values()):
+        raise CommandError('--mix 가중치 합이 0입니다.')
+    return weights
+
+
+def process_tree_rss_kb(root_pid):
+    """
+    root_pid 와 모든 자식 프로세스(gunicorn 워커)의 RSS 합계(KB).
+    /proc 이 없는 macOS 에서도 동작하도록 ps 로 읽습니다. (RSS 단위는 Linux/macOS 모두 KB)
+    """
+    try:
+        output = subprocess.run(
+            ['ps', '-A', '-o', 'pid=,ppid=,rss='], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise CommandError(f"--server-pid: ps 로 메모리를 읽지 못했습니다: {exc}")
+
+    children = {}
+    rss = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) != 3 or not all(field.isdigit() for field in fields):
+            continue
+        pid, ppid, rss_kb = map(int, fields)
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = rss_kb
+
+    total_kb = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        total_kb += rss.get(pid, 0)
+    return total_kb
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.rate_limited = 0
+        self.client_errors = 0
+        self.statuses = {}
+
+
+class LoadRecorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {name: EndpointStats() for name in ENDPOINTS}
+        self.total = 0
+        self.total_errors = 0
+
+    def record(self, endpoint, elapsed, status):
+        with self.lock:
+            stats = self.endpoints[endpoint]
+            stats.latencies.append(elapsed)
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            self.total += 1
+            if status == 429:
+                stats.rate_limited += 1
+            elif status is None or status >= 500:
+                stats.errors += 1
+                self.total_errors += 1
+            elif status >= 400:
+                stats.client_errors += 1
+
+    def snapshot(self):
+        with self.lock:
+            return self.total, self.total_errors
+
+
+class LoadClient:
+    def __init__(self, client_id, options, rng):
+        self.base_url = options['base_url'].rstrip('/')
+        self.timeout = options['timeout']
+        self.options = options
+        self.rng = rng
+        self.session = requests.Session()
+        # rate limit 이 클라이언트별로 적용되도록 가상의 IP를 부여합니다. (get_client_ip 참고)
+        self.session.headers['X-Forwarded-For'] = f'198.18.{client_id // 250}.{client_id % 250 + 1}'
+        self.session.headers['Referer'] = self.base_url + '/'
+        self.csrf_token = None
+
+    def ensure_csrf_token(self):
+        if self.csrf_token is None:
+            response = self.session.get(f'{self.base_url}/games/kkomantle/', timeout=self.timeout)
+            match = CSRF_TOKEN_RE.search(response.text)
+            if not match:
+                raise requests.RequestException('CSRF 토큰을 찾을 수 없습니다.')
+            self.csrf_token = match.group(1)
+        return self.csrf_token
+
+    def post_json(self, path, payload):
+        return self.session.post(
+            f'{self.base_url}{path}',
+            data=json.dumps(payload),
+            headers={'Content-Type': 'application/json', 'X-CSRFToken': self.ensure_csrf_token()},
+            timeout=self.timeout,
+        )
+
+    def get(self, path):
+        return self.session.get(f'{self.base_url}{path}', timeout=self.timeout)
+
+    def call(self, endpoint):
+        rng = self.rng
+        if endpoint == 'home':
+            return self.get('/')
+        if endpoint == 'blog':
+            return self.get(f"/blog/?page={rng.randint(1, self.options['blog_pages'])}")
+        if endpoint == 'post':
+            return self.get(f"/post/{rng.randint(1, self.options['post_ids'])}/")
+        if endpoint == 'guess':
+            return self.post_json('/api/guess/kkomantle/', {'word': rng.choice(self.options['words'])})
+        if endpoint == 'rank':
+            return self.get(f'/api/rank/{rng.choice(RANK_GAMES)}/')
+
+        game = rng.choice(RANK_GAMES)
+        score = {'2048': rng.randint(4, 50000), 'reaction': rng.randint(150, 600), 'wordle': rng.randint(1, 6)}[game]
+        return self.post_json(f'/api/rank/{game}/', {'player_name': f'load{rng.randint(0, 999)}', 'score': score})
+
+
+class Command(BaseCommand):
+    help = '실행 중인 사이트에 블로그/추측/점수/랭킹 혼합 트래픽을 보내는 HTTP 부하 생성기'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:4000')
+        parser.add_argument('--clients', type=int, default=50, help='동시 클라이언트 수')
+        parser.add_argument('--duration', type=float, help='실행 시간(초, 기본 60 / soak 3600)')
+        parser.add_argument('--ramp-up', type=float, default=5, help='클라이언트를 나눠 시작하는 시간(초)')
+        parser.add_argument('--think-ms', type=float, default=0, help='요청 사이 대기(ms)')
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'엔드포인트 비율 (기본 {DEFAULT_MIX})')
+        parser.add_argument('--words-file', help='추측에 쓸 단어 파일 (한 줄에 한 단어)')
+        parser.add_argument('--post-ids', type=int, default=40, help='/post/<id>/ 에 쓸 최대 id')
+        parser.add_argument('--blog-pages', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--report-interval', type=float, default=10, help='진행 상황 출력 주기(초)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 경로')
+
+        parser.add_argument('--fake-wp', action='store_true', help='가짜 WordPress 서버를 함께 실행')
+        parser.add_argument('--wp-port', type=int, default=4081)
+        parser.add_argument('--wp-latency-ms', type=float, default=50)
+        parser.add_argument('--wp-jitter-ms', type=float, default=20)
+        parser.add_argument('--wp-failure-rate', type=float, default=0.0)
+        parser.add_argument('--wp-hang-rate', type=float, default=0.0)
+
+        parser.add_argument('--soak', action='store_true', help='메모리 증가를 추적하는 장시간 모드')
+        parser.add_argument('--server-pid', type=int, help='RSS를 추적할 서버 (gunicorn 마스터) PID')
+        parser.add_argument('--max-rss-growth-mb', type=float, help='soak 중 허용하는 최대 RSS 증가량(MB)')
+
+    def handle(self, *args, **options):
+        weights = parse_mix(options['mix'])
+        options['words'] = list(DEFAULT_WORDS)
+        if options['words_file']:
+            with open(options['words_file'], encoding='utf-8') as words_file:
+                options['words'] = [line.strip() for line in words_file if line.strip()]
+        if options['soak'] and not options['server_pid']:
+            raise CommandError('--soak 에는 --server-pid 가 필요합니다.')
+        if options['duration'] is None:
+            options['duration'] = 3600 if options['soak'] else 60
+
+        fake = None
+        if options['fake_wp']:
+            fake = FakeWordPress(
+                port=options['wp_port'],
+                latency_ms=options['wp_latency_ms'],
+                jitter_ms=options['wp_jitter_ms'],
+                failure_rate=options['wp_failure_rate'],
+                hang_rate=options['wp_hang_rate'],
+                post_count=options['post_ids'],
+                seed=options['seed'],
+            ).start()
+            self.stdout.write(f"가짜 WordPress: {fake.base_url} (사이트의 WP_BASE_URL 이 이 주소여야 합니다)")
+
+        try:
+            report = self.run_load(options, weights)
+        finally:
+            if fake is not None:
+                fake.stop()
+        if fake is not None:
+            report['fake_wp'] = {'requests': fake.request_count}
+
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                json.dump(report, output_file, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+        soak = report.get('soak')
+        if soak and options['max_rss_growth_mb'] is not None and soak['rss_growth_mb'] > options['max_rss_growth_mb']:
+            raise CommandError(
+                f"RSS 증가 {soak['rss_growth_mb']}MB 가 허용치 {options['max_rss_growth_mb']}MB 를 넘었습니다."
+            )
+
+    def run_load(self, options, weights):
+        names = list(weights)
+        endpoint_weights = [weights[name] for name in names]
+        seed_rng = random.Random(options['seed'])
+        recorder = LoadRecorder()
+        stop_event = threading.Event()
+        clients = options['clients']
+
+        def worker(client_id, client_seed):
+            rng = random.Random(client_seed)
+            client = LoadClient(client_id, options, rng)
+            if options['ramp_up'] > 0 and clients > 1:
+                stop_event.wait(options['ramp_up'] * client_id / clients)
+            while not stop_event.is_set():
+                endpoint = rng.choices(names, weights=endpoint_weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = client.call(endpoint).status_code
+                except requests.RequestException:
+                    status = None
+                recorder.record(endpoint, time.perf_counter() - started, status)
+                if options['think_ms']:
+                    stop_event.wait(options['think_ms'] / 1000)
+
+        threads = [
+            threading.Thread(target=worker, args=(i, seed_rng.random()), name=f'load-{i}', daemon=True)
+            for i in range(clients)
+        ]
+        rss_samples = []
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        last_total = 0
+        last_tick = started
+        deadline = started + options['duration']
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            stop_event.wait(min(options['report_interval'], deadline - now))
+            now = time.monotonic()
+            total, total_errors = recorder.snapshot()
+            line = (
+                f"[{now - started:7.1f}s] requests={total} "
+                f"rps={(total - last_total) / max(now - last_tick, 1e-9):.1f} errors={total_errors}"
+            )
+            if options['server_pid']:
+                rss_mb = process_tree_rss_kb(options['server_pid']) / 1024
+                rss_samples.append((round(now - started, 1), round(rss_mb, 1)))
+                line += f" server_rss={rss_mb:.1f}MB"
+            self.stderr.write(line)
+            last_total, last_tick = total, now
+
+        stop_event.set()
+        for thread in threads:
+            thread.join(options['timeout'])
+        elapsed = time.monotonic() - started
+
+        report = {
+            'meta': {
+                'base_url': options['base_url'],
+                'clients': clients,
+                'duration': round(elapsed, 2),
+                'mix': weights,
+            },
+            'endpoints': {},
+        }
+        for name in ENDPOINTS:
+            stats = recorder.endpoints[name]
+            if not stats.latencies:
+                continue
+            summary = summarize_latencies(stats.latencies, elapsed)
+            count = summary['count']
+            summary.update({
+                'error_rate': round(stats.errors / count, 4),
+                'rate_limited_rate': round(stats.rate_limited / count, 4),
+                'client_error_rate': round(stats.client_errors / count, 4),
+                'statuses': stats.statuses,
+            })
+            report['endpoints'][name] = summary
+
+        if rss_samples:
+            report['soak'] = self.summarize_rss(rss_samples)
+        return report
+
+    def summarize_rss(self, samples):
+        first, last = samples[0][1], samples[-1][1]
+        span_hours = (samples[-1][0] - samples[0][0]) / 3600
+        # 최소제곱 기울기로 MB/시간 추세를 구합니다. (GC 등 순간 변동 완화)
+        slope = 0.0
+        if len(samples) > 1 and span_hours > 0:
+            mean_t = sum(t for t, _ in samples) / len(samples)
+            mean_m = sum(m for _, m in samples) / len(samples)
+            denominator = sum((t - mean_t) ** 2 for t, _ in samples)
+            if denominator:
+                slope = sum((t - mean_t) * (m - mean_m) for t, m in samples) / denominator * 3600
+        return {
+            'rss_start_mb': first,
+            'rss_end_mb': last,
+            'rss_peak_mb': max(m for _, m in samples),
+            'rss_growth_mb': round(last - first, 1),
+            'rss_slope_mb_per_hour': round(slope, 1),
+            'samples': samples,
+        }
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'endpoint':<8}{'count':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'err %':>8}{'429 %':>8}"
+        )
+        for name, stats in report['endpoints'].items():
+            self.stdout.write(
+                f"{name:<8}{stats['count']:>8}{stats['ops_per_sec']:>9.1f}{stats['p50_ms']:>10.1f}"
+                f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+                f"{stats['error_rate'] * 100:>8.2f}{stats['rate_limited_rate'] * 100:>8.2f}"
+            )
+        soak = report.get('soak')
+        if soak:
+            self.stdout.write(
+                f"server RSS: {soak['rss_start_mb']}MB -> {soak['rss_end_mb']}MB "
+                f"(peak {soak['rss_peak_mb']}MB, trend {soak['rss_slope_mb_per_hour']}MB/h)"
+            )
@@ -0,0 +1,75 @@
+import json
+import os
+import signal
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import embeddings, views
+
+
+class Command(BaseCommand):
+    help = (
+        '임베딩 모델 매니페스트(WORD2VEC_MODEL_MANIFEST)를 새 버전으로 바꾸고 gunicorn 마스터에 HUP 을 보냅니다. '
+        '마스터가 읽고 검증한 뒤 워커를 다시 fork 합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='새 모델 파일 (.vec/.txt, .bin, 또는 gensim .kv)')
+        parser.add_argument('--name', help='버전 이름 (기본: 파일 이름)')
+        parser.add_argument('--limit', type=int, default=getattr(settings, 'WORD2VEC_LIMIT', None))
+        parser.add_argument(
+            '--export-kv', metavar='PATH',
+            help='검증 후 gensim .kv 형식으로 저장하고 그 파일을 가리킵니다. (워커들이 mmap 으로 공유)',
+        )
+        parser.add_argument('--no-check', action='store_true', help='이 프로세스에서 미리 로드/검증하지 않음')
+        parser.add_argument(
+            '--pidfile', default=os.getenv('GUNICORN_PIDFILE', 'gunicorn.pid'),
+            help='HUP 을 보낼 gunicorn 마스터 pid 파일 (마스터가 새 버전을 로드한 뒤 워커를 다시 fork)',
+        )
+
+    def handle(self, *args, **options):
+        manifest = getattr(settings, 'WORD2VEC_MODEL_MANIFEST', '')
+        if not manifest:
+            raise CommandError('WORD2VEC_MODEL_MANIFEST 가 설정되어 있지 않습니다.')
+
+        path = os.path.abspath(options['path'])
+        if not os.path.exists(path):
+            raise CommandError(f'모델 파일이 없습니다: {path}')
+        name = options['name'] or os.path.basename(path)
+
+        if not options['no_check'] or options['export_kv']:
+            try:
+                version = embeddings.ModelVersion.load(name, path, options['limit'])
+                embeddings.validate(version, views.pinned_secret_words())
+            except embeddings.ModelValidationError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(
+                f"검증 완료: {name} ({len(version.model.index_to_key)} 단어, "
+                f"{version.load_seconds:.1f}초, {version.memory_bytes / 1024 / 1024:.0f}MB)"
+            )
+            if options['export_kv']:
+                path = os.path.abspath(options['export_kv'])
+                version.model.save(path)
+                self.stdout.write(f".kv 로 저장: {path}")
+
+        spec = {'name': name, 'path': path, 'limit': options['limit']}
+        # 워커가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 rename
+        directory = os.path.dirname(os.path.abspath(manifest))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, suffix='.tmp') as tmp:
+            json.dump(spec, tmp)
+        os.replace(tmp.name, manifest)
+        self.stdout.write(f"매니페스트 갱신: {manifest} -> {name}")
+        self.reload_master(options['pidfile'])
+
+    def reload_master(self, pidfile):
+        try:
+            with open(pidfile) as pid_file:
+                pid = int(pid_file.read().strip())
+            os.kill(pid, signal.SIGHUP)
+        except (OSError, ValueError):
+            self.stdout.write("gunicorn 마스터를 찾지 못했습니다. 실행 중인 프로세스가 매니페스트를 감시해 교체합니다.")
+            return
+        self.stdout.write(f"gunicorn 마스터 {pid} 에 HUP: 마스터에서 로드한 뒤 워커를 다시 띄웁니다.")
@@ -0,0 +1,418 @@
+"""
+프로세스 내 성능 지표 수집과 Prometheus 텍스트 포맷 노출.
+
+- MetricsMiddleware: 뷰별 지연시간, 요청당 DB 쿼리 수/시간을 기록합니다.
+- timed(): WordPress 호출, 임베딩 계산 등 구간 시간을 히스토그램에 기록합니다.
+- metrics_view: METRICS_TOKEN 으로 보호되는 /metrics 엔드포인트.
+
+gunicorn 처럼 워커가 여러 개면 METRICS_MULTIPROC_DIR 을 지정하세요. 각 워커가 주기적으로
+스냅샷을 파일로 남기고, /metrics 는 모든 워커의 값을 합쳐서 보여줍니다.
+"""
+
+import contextvars
+import hmac
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'lbplate_http_request_duration_seconds': (
+        'histogram', 'View latency in seconds.', LATENCY_BUCKETS),
+    'lbplate_db_queries_per_request': (
+        'histogram', 'Number of DB queries per request.', QUERY_COUNT_BUCKETS),
+    'lbplate_db_query_duration_seconds': (
+        'histogram', 'Total DB query time per request in seconds.', LATENCY_BUCKETS),
+    'lbplate_wp_request_duration_seconds': (
+        'histogram', 'WordPress upstream request time in seconds.', LATENCY_BUCKETS),
+    'lbplate_embedding_duration_seconds': (
+        'histogram', 'Embedding model compute time in seconds.', LATENCY_BUCKETS),
+    'lbplate_cache_requests_total': (
+        'counter', 'Application cache lookups by result.', None),
+    'lbplate_rate_limit_rejections_total': (
+        'counter', 'Requests rejected by is_rate_limited.', None),
+    'lbplate_circuit_state': (
+        'gauge', 'Circuit breaker state (0=closed, 1=half_open, 2=open).', None),
+    'lbplate_circuit_transitions_total': (
+        'counter', 'Circuit breaker state transitions.', None),
+    'lbplate_circuit_rejections_total': (
+        'counter', 'Calls failed fast because the circuit was not closed.', None),
+    'lbplate_model_load_seconds': (
+        'gauge', 'Seconds spent loading and preparing each embedding model version.', None),
+    'lbplate_model_memory_bytes': (
+        'gauge', 'Vector and norm memory held by each loaded embedding model version.', None),
+    'lbplate_model_active': (
+        'gauge', '1 for the embedding model version serving requests.', None),
+    'lbplate_model_swaps_total': (
+        'counter', 'Embedding model activations and failed loads.', None),
+    'lbplate_executor_rejections_total': (
+        'counter', 'Jobs refused with 503 because a bounded executor was saturated.', None),
+    'lbplate_log_records_dropped_total': (
+        'counter', 'Log records dropped because the background log queue was full.', None),
+}
+
+# 요청 하나 동안 누적되는 구간 시간 (구조화 로그 등에서 사용)
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, labels=None, amount=1):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, labels=None):
+        with self.lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name, value, labels=None):
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self.lock:
+            entry = self.histograms.get(key)
+            if entry is None:
+                entry = self.histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for index, upper in enumerate(buckets):
+                if value <= upper:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, list(labels), value] for (name, labels), value in self.gauges.items()],
+                'histograms': [
+                    [name, list(labels), list(entry[0]), entry[1], entry[2]]
+                    for (name, labels), entry in self.histograms.items()
+                ],
+            }
+
+    def merge(self, snapshot, include_gauges=True):
+        """다른 프로세스의 snapshot 을 더합니다. (게이지는 최댓값)"""
+        with self.lock:
+            for name, labels, value in snapshot.get('counters', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self.counters[key] = self.counters.get(key, 0) + value
+            if include_gauges:
+                for name, labels, value in snapshot.get('gauges', []):
+                    key = (name, tuple(tuple(pair) for pair in labels))
+                    self.gauges[key] = max(self.gauges.get(key, value), value)
+            for name, labels, bucket_counts, total, count in snapshot.get('histograms', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                entry = self.histograms.get(key)
+                if entry is None:
+                    entry = self.histograms[key] = [[0] * len(bucket_counts), 0.0, 0]
+                entry[0] = [a + b for a, b in zip(entry[0], bucket_counts)]
+                entry[1] += total
+                entry[2] += count
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)."""
+        snapshot = self.snapshot()
+        by_name = {}
+        for kind in ('counters', 'gauges', 'histograms'):
+            for item in snapshot[kind]:
+                by_name.setdefault(item[0], []).append(item)
+
+        lines = []
+        for name in sorted(by_name):
+            metric_type, help_text, buckets = METRICS[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for item in sorted(by_name[name], key=lambda entry: entry[1]):
+                labels = item[1]
+                if metric_type != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(item[2])}')
+                    continue
+                cumulative = 0
+                for upper, bucket_count in zip(buckets, item[2]):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_format_labels(labels, le=_format_value(upper))} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels, le="+Inf")} {item[4]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(item[3])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {item[4]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, le=None):
+    pairs = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def inc(name, amount=1, **labels):
+    registry.inc(name, labels, amount)
+
+
+def observe(name, value, **labels):
+    registry.observe(name, value, labels)
+
+
+def set_gauge(name, value, **labels):
+    registry.set_gauge(name, value, labels)
+
+
+def add_request_timing(key, seconds):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[f'{key}_seconds'] = timings.get(f'{key}_seconds', 0.0) + seconds
+        timings[f'{key}_calls'] = timings.get(f'{key}_calls', 0) + 1
+
+
+def current_request_timings():
+    return _request_timings.get()
+
+
+@contextmanager
+def timed(metric, request_key=None, **labels):
+    """
+    블록 실행 시간을 metric 히스토그램에 기록합니다.
+    yield 되는 labels 를 블록 안에서 바꿔 결과(outcome 등)를 남길 수 있습니다.
+    """
+    started = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe(metric, elapsed, labels)
+        if request_key:
+            add_request_timing(request_key, elapsed)
+
+
+# ==========================================
+# 멀티 프로세스(gunicorn) 지원
+# ==========================================
+
+_flush_state = {'pid': None, 'last': 0.0}
+_ARCHIVE_FILE = 'archive.json'
+
+
+def _multiproc_dir():
+    return getattr(settings, 'METRICS_MULTIPROC_DIR', '') or ''
+
+
+def _write_json(path, payload):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as tmp_file:
+        json.dump(payload, tmp_file)
+    os.replace(tmp_path, path)
+
+
+def flush(force=False):
+    """이 프로세스의 지표를 METRICS_MULTIPROC_DIR/<pid>.json 으로 남깁니다."""
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and _flush_state['pid'] == os.getpid() \
+            and now - _flush_state['last'] < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+        return
+    _flush_state.update(pid=os.getpid(), last=now)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        _write_json(os.path.join(directory, f'{os.getpid()}.json'), registry.snapshot())
+    except OSError:
+        pass
+
+
+def mark_process_dead(pid):
+    """
+    종료된 워커의 카운터/히스토그램을 archive.json 에 합치고 파일을 지웁니다.
+    (gunicorn 마스터의 child_exit 에서 호출 — 재시작된 워커가 있어도 누적값이 유지됩니다.)
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    path = os.path.join(directory, f'{pid}.json')
+    archive_path = os.path.join(directory, _ARCHIVE_FILE)
+    try:
+        with open(path) as worker_file:
+            worker_snapshot = json.load(worker_file)
+    except (OSError, ValueError):
+        return
+
+    archive = MetricsRegistry()
+    try:
+        with open(archive_path) as archive_file:
+            archive.merge(json.load(archive_file), include_gauges=False)
+    except (OSError, ValueError):
+        pass
+    archive.merge(worker_snapshot, include_gauges=False)
+    try:
+        _write_json(archive_path, archive.snapshot())
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def reset_multiproc_dir():
+    """이전 실행이 남긴 워커 스냅샷을 지웁니다. (gunicorn 마스터 시작 시, Prometheus 에는 카운터 리셋으로 보임)"""
+    directory = _multiproc_dir()
+    if not directory or not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                pass
+
+
+def reset_inherited():
+    """
+    fork 직후 워커에서 호출: 마스터에서 물려받은 카운터/히스토그램(모델 로드 등)을 비웁니다.
+    그대로 두면 워커마다 다시 내보내고 재시작될 때마다 archive 에 또 더해집니다.
+    마스터의 값은 마스터가 직접 남깁니다. (게이지는 현재 상태라 유지)
+    """
+    with registry.lock:
+        registry.counters.clear()
+        registry.histograms.clear()
+
+
+def collect():
+    """현재 프로세스와 (설정 시) 다른 워커들의 지표를 합친 registry 를 돌려줍니다."""
+    directory = _multiproc_dir()
+    if not directory or not os.path.isdir(directory):
+        return registry
+
+    merged = MetricsRegistry()
+    merged.merge(registry.snapshot())
+    own_file = f'{os.getpid()}.json'
+    for filename in os.listdir(directory):
+        if not filename.endswith('.json') or filename == own_file:
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as snapshot_file:
+                merged.merge(json.load(snapshot_file), include_gauges=filename != _ARCHIVE_FILE)
+        except (OSError, ValueError):
+            continue
+    return merged
+
+
+# ==========================================
+# 미들웨어 / 엔드포인트
+# ==========================================
+
+# 메서드는 클라이언트가 임의로 보낼 수 있으므로 알려진 것 외에는 하나로 묶습니다. (라벨 폭증 방지)
+KNOWN_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+def method_label(method):
+    return method if method in KNOWN_METHODS else 'other'
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        timings = {'db_seconds': 0.0, 'db_calls': 0}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._time_query):
+                response = self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        self.record(request, response, started, timings)
+        return response
+
+    async def __acall__(self, request):
+        # ASGI: DB 호출은 sync_to_async 스레드의 커넥션에서 실행되어 execute_wrapper 로 잴 수 없습니다.
+        timings = {'db_seconds': 0.0, 'db_calls': 0}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timings.reset(token)
+        self.record(request, response, started, timings)
+        return response
+
+    def record(self, request, response, started, timings):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        if view != 'metrics':
+            registry.observe(
+                'lbplate_http_request_duration_seconds',
+                time.perf_counter() - started,
+                {'view': view, 'method': method_label(request.method), 'status': str(response.status_code)},
+            )
+            registry.observe('lbplate_db_queries_per_request', timings['db_calls'], {'view': view})
+            registry.observe('lbplate_db_query_duration_seconds', timings['db_seconds'], {'view': view})
+        flush()
+
+    @staticmethod
+    def _time_query(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            add_request_timing('db', time.perf_counter() - started)
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return HttpResponseNotFound()
+
+    provided = request.META.get('HTTP_AUTHORIZATION', '')
+    if not hmac.compare_digest(provided.encode(), f'Bearer {token}'.encode()):
+        return HttpResponseForbidden()
+
+    return HttpResponse(collect().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+_WP_ID_RE = re.compile(r'/\d+')
+
+
+def wp_endpoint_label(endpoint):
+    """'posts/123' -> 'posts/:id' (라벨 카디널리티 제한)"""
+    return _WP_ID_RE.sub('/:id', endpoint)
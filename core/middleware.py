@@ -0,0 +1,168 @@
+import hashlib
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from django.utils.text import compress_string
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # Brotli 가 없으면 gzip 만 사용
+    brotli = None
+
+COMPRESSED_KEY = 'compressed:{}:{}'
+# 페이지/압축본 캐시 키에 넣는 쿼리 파라미터 (블로그 화면이 읽는 것)
+CACHEABLE_QUERY_PARAMS = ('page', 'category', 'search')
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+_ACCEPT_ENCODING_RE = re.compile(r'\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?', re.I)
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    ASGI 에서도 쓸 수 있는 WhiteNoise.
+    원래 미들웨어는 sync 전용이라 ASGI 에서는 모든 요청이 스레드를 거치게 됩니다.
+    정적 파일이 아닌 요청은 바로 다음 단계로 넘기고, 정적 파일 응답만 스레드에서 만듭니다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+        return await self.get_response(request)
+
+
+def page_cache_url(request):
+    """
+    페이지 캐시(PAGE_CACHE_ALIAS) 키용 URL. 본문에 canonical URL 이 들어가므로 scheme/host 를 포함합니다.
+    임의의 쿼리로 캐시를 채워 다른 페이지를 밀어내지 못하도록, 모르는 파라미터가 있으면 None.
+    """
+    if any(name not in CACHEABLE_QUERY_PARAMS for name in request.GET):
+        return None
+    query = urlencode([(name, request.GET[name]) for name in CACHEABLE_QUERY_PARAMS if name in request.GET])
+    return f"{request.scheme}://{request.get_host()}{request.path}?{query}"
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 에서 q=0 이 아닌 인코딩 이름들"""
+    accepted = set()
+    for part in header.lower().split(','):
+        match = _ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2) or 1)
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(match.group(1))
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=getattr(settings, 'COMPRESS_BROTLI_QUALITY', 5))
+    return compress_string(content)
+
+
+class CompressionMiddleware:
+    """
+    HTML/JSON 같은 텍스트 응답을 Accept-Encoding 에 맞춰 br 또는 gzip 으로 압축합니다.
+    (정적 파일은 WhiteNoise 가 collectstatic 때 만든 압축본을 씁니다.)
+
+    ETag 가 있는 공개 응답(블로그, 리더보드, 공개 화면)은 압축본을 URL(page_cache_url) + ETag 로 페이지 캐시에 저장해서
+    같은 버전은 인코딩별로 한 번만 압축합니다. 압축한 응답의 ETag 는 weak 로 바꾸며,
+    If-None-Match 는 weak 비교라 304 응답은 그대로 동작합니다.
+    CSRF 토큰이 들어간 private 응답은 BREACH 공격을 피하려고 압축하지 않습니다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESS_MIN_SIZE', 200)
+        self.cache_timeout = getattr(settings, 'COMPRESS_CACHE_TIMEOUT', 3600)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        cache_control = response.get('Cache-Control', '')
+        if 'private' in cache_control or 'no-transform' in cache_control:
+            return response
+
+        # 압축 여부와 상관없이 프록시/브라우저 캐시가 인코딩별로 나눠 저장하도록
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        etag = response.get('ETag')
+        url = page_cache_url(request) if etag and 'no-store' not in cache_control else None
+        if url is not None and self.cache_timeout > 0:
+            key = COMPRESSED_KEY.format(encoding, hashlib.sha1(f"{url}|{etag}".encode()).hexdigest())
+            page_cache = caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+            compressed = page_cache.get(key)
+            if compressed is None:
+                metrics.inc('lbplate_cache_requests_total', cache='compressed', result='miss')
+                compressed = compress(response.content, encoding)
+                page_cache.set(key, compressed, self.cache_timeout)
+            else:
+                metrics.inc('lbplate_cache_requests_total', cache='compressed', result='hit')
+        else:
+            compressed = compress(response.content, encoding)
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
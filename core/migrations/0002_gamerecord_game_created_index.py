@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamerecord',
+            index=models.Index(fields=['game_type', 'created_at'], name='core_record_game_created_idx'),
+        ),
+    ]
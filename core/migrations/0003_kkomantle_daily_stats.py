@@ -0,0 +1,40 @@
+# Generated by Django 4.2.28 on 2026-10-19 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_gamerecord_game_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KkomantleDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('players', models.PositiveIntegerField(default=0)),
+                ('solvers', models.PositiveIntegerField(default=0)),
+                ('guesses', models.PositiveIntegerField(default=0)),
+                ('solve_histogram', models.JSONField(default=dict)),
+                ('wrong_guesses', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KkomantlePlayerDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('player', models.CharField(max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('solved_attempts', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='kkomantleplayerday',
+            constraint=models.UniqueConstraint(fields=('date', 'player'), name='core_kkomantle_player_day_unique'),
+        ),
+    ]
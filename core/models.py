@@ -15,6 +15,40 @@ class GameRecord(models.Model):
 
     class Meta:
         ordering = ['-score', '-created_at'] # 기본은 점수 높은 순
+        indexes = [
+            # 오늘의 랭킹 조회 (game_type + created_at 범위)
+            models.Index(fields=['game_type', 'created_at'], name='core_record_game_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.game_type} - {self.player_name}: {self.score}"
\ No newline at end of file
+        return f"{self.game_type} - {self.player_name}: {self.score}"
+
+
+class KkomantlePlayerDay(models.Model):
+    """꼬맨틀 하루 참여 기록 (플레이어는 익명 해시) — core/stats.py 가 주기적으로 합쳐서 저장"""
+    date = models.DateField()
+    player = models.CharField(max_length=16)
+    attempts = models.PositiveIntegerField(default=0)
+    solved_attempts = models.PositiveIntegerField(null=True, blank=True)  # 맞히기까지 시도 횟수
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'player'], name='core_kkomantle_player_day_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.player}: {self.attempts}"
+
+
+class KkomantleDailyStats(models.Model):
+    """꼬맨틀 일일 요약 (읽기 엔드포인트는 이 한 줄만 조회)"""
+    date = models.DateField(unique=True)
+    players = models.PositiveIntegerField(default=0)
+    solvers = models.PositiveIntegerField(default=0)
+    guesses = models.PositiveIntegerField(default=0)
+    solve_histogram = models.JSONField(default=dict)  # 시도 횟수 -> 맞힌 사람 수
+    wrong_guesses = models.JSONField(default=dict)  # 단어 -> 횟수 (상위 일부만 유지)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.date}: {self.solvers}/{self.players}"
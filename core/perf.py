@@ -0,0 +1,26 @@
+"""벤치마크/부하 테스트에서 공통으로 쓰는 측정 도우미."""
+
+import math
+
+
+def percentile(sorted_values, pct):
+    """정렬된 리스트에서 nearest-rank 방식으로 백분위 값을 구합니다."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(samples, elapsed_seconds):
+    """초 단위 지연시간 샘플을 ops/sec 와 ms 단위 백분위 요약으로 바꿉니다."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'count': count,
+        'ops_per_sec': round(count / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0,
+        'mean_ms': round(sum(ordered) / count * 1000, 4) if count else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 4),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 4),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 4),
+        'max_ms': round(ordered[-1] * 1000, 4) if count else 0.0,
+    }
@@ -3,6 +3,9 @@
  * JSON 데이터 파일에서 무작위 문구를 가져와 화면에 출력합니다.
  */
 
+// 해시된 파일명(콘텐츠가 바뀌면 URL도 바뀜)이라 캐시를 무력화할 필요가 없습니다.
+const QUOTES_URL = document.currentScript.dataset.quotesUrl;
+
 async function showFortune() {
     const displayArea = document.getElementById('fortune-display');
     const titleArea = document.getElementById('fortune-title');
@@ -12,7 +15,7 @@ async function showFortune() {
 
     try {
         // 2. JSON 데이터 파일 가져오기
-        const response = await fetch('/static/core/json/quotes.json?v=' + new Date().getTime());
+        const response = await fetch(QUOTES_URL);
         
         if (!response.ok) {
             throw new Error(`네트워크 응답 에러 (상태: ${response.status})`);
@@ -1,3 +1,6 @@
+// 템플릿의 <script data-*> 속성에서 API 주소와 CSRF 토큰을 읽습니다.
+const GAME_CONFIG = { ...document.currentScript.dataset };
+
 const input = document.getElementById('wordInput');
 const list = document.getElementById('guessList');
 const submitBtn = document.getElementById('submitBtn');
@@ -9,6 +12,77 @@ const shareBtn = document.getElementById('shareBtn');
 let guesses = [];
 let isGameOver = false;
 
+// 정답 주변 상위 단어 테이블 (단어는 salt 를 붙인 해시로만 옵니다)
+let neighbourTable = null;
+let neighbourTableLoading = null;
+// 브라우저에서 채점해서 아직 서버에 알리지 않은 단어들
+let pendingLocalWords = [];
+
+function loadNeighbourTable() {
+    // crypto.subtle 은 HTTPS(또는 localhost)에서만 쓸 수 있어서, 없으면 항상 서버로 채점합니다.
+    if (!GAME_CONFIG.neighboursUrl || !(window.crypto && window.crypto.subtle)) return null;
+    if (neighbourTableLoading) return neighbourTableLoading;
+
+    neighbourTableLoading = fetch(GAME_CONFIG.neighboursUrl)
+        .then((response) => (response.ok ? response.json() : null))
+        .then((data) => {
+            if (!data) return;
+            const ranks = new Map();
+            data.hashes.forEach((hash, index) => ranks.set(hash, index));
+            neighbourTable = { ...data, ranks };
+        })
+        .catch((err) => console.error(err))
+        .finally(() => {
+            neighbourTableLoading = null;
+        });
+    return neighbourTableLoading;
+}
+
+async function hashWord(salt, word, length) {
+    const digest = await window.crypto.subtle.digest('SHA-256', new TextEncoder().encode(salt + word));
+    const hex = Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+    return hex.slice(0, length);
+}
+
+async function scoreLocally(word) {
+    if (neighbourTable && Date.now() / 1000 >= neighbourTable.expires_at) {
+        // 자정이 지나 정답이 바뀌었으면 테이블을 다시 받습니다.
+        neighbourTable = null;
+        loadNeighbourTable();
+    }
+    if (!neighbourTable) return null;
+
+    try {
+        const hash = await hashWord(neighbourTable.salt, word, neighbourTable.hash_length);
+        const index = neighbourTable.ranks.get(hash);
+        if (index === undefined) return null;
+        return { score: neighbourTable.scores[index], rank: index + 1 };
+    } catch (err) {
+        console.error(err);
+        return null;
+    }
+}
+
+async function showSolverCount() {
+    const solverCount = document.getElementById('solverCount');
+    if (!solverCount || !GAME_CONFIG.statsUrl) return;
+
+    try {
+        const response = await fetch(GAME_CONFIG.statsUrl);
+        if (!response.ok) return;
+        const data = await response.json();
+        if (data.solvers > 0) {
+            solverCount.textContent = `오늘 ${data.solvers}명이 정답을 맞혔어요.`;
+            solverCount.hidden = false;
+        }
+    } catch (err) {
+        console.error(err);
+    }
+}
+
+loadNeighbourTable();
+showSolverCount();
+
 function setStatus(message, isError = false) {
     if (!statusText) return;
     statusText.innerText = message;
@@ -46,6 +120,19 @@ async function submitGuess() {
     setSubmitting(true);
     setStatus('단어를 확인하는 중입니다...');
 
+    // 상위 단어는 받아 둔 테이블로 바로 채점 (정답은 테이블에 없어서 항상 서버로 갑니다)
+    const local = await scoreLocally(word);
+    if (local) {
+        setSubmitting(false);
+        addGuess(word, local.score, local.rank, false);
+        // 통계용으로 다음 서버 요청에 같이 보냅니다.
+        pendingLocalWords.push(word);
+        setStatus('좋아요! 다음 단어도 시도해보세요.');
+        input.value = '';
+        input.focus();
+        return;
+    }
+
     try {
         const response = await fetch(GAME_CONFIG.apiUrl, {
             method: 'POST',
@@ -53,12 +140,17 @@ async function submitGuess() {
                 'Content-Type': 'application/json',
                 'X-CSRFToken': GAME_CONFIG.csrfToken,
             },
-            body: JSON.stringify({ word }),
+            body: JSON.stringify({ word, attempts: guesses.length + 1, local_words: pendingLocalWords }),
         });
 
         const data = await response.json();
         setSubmitting(false);
 
+        if (response.ok && (data.result === 'success' || data.result === 'correct')) {
+            // 채점된 요청에만 통계가 기록되므로, 그때 비웁니다.
+            pendingLocalWords = [];
+        }
+
         if (!response.ok || data.result === 'fail' || data.result === 'error') {
             setStatus(data.message || '처리 중 오류가 발생했습니다.', true);
         } else {
@@ -1,3 +1,6 @@
+// 템플릿의 <script data-*> 속성에서 API 주소와 CSRF 토큰을 읽습니다.
+window.gameConfig = { ...document.currentScript.dataset };
+
 let state = 'waiting'; // waiting, ready, now
 let startTime;
 let timeoutId;
@@ -1,3 +1,6 @@
+// 템플릿의 <script data-*> 속성에서 API 주소와 CSRF 토큰을 읽습니다.
+window.gameConfig = { ...document.currentScript.dataset };
+
 // === 1. 단어 리스트 및 초기화 ===
 const WORDS = [
     "APPLE", "BEACH", "BRAIN", "BREAD", "BRUSH", "CHAIR", "CHEST", "CHORD", "CLICK", "CLOCK",
@@ -0,0 +1,169 @@
+"""
+꼬맨틀 일일 통계 (write-behind).
+
+요청 스레드는 메모리 버퍼만 갱신하고, 백그라운드 스레드가 KKOMANTLE_STATS_FLUSH_INTERVAL 초마다
+버퍼를 KkomantlePlayerDay(플레이어별 기록)에 합친 뒤 KkomantleDailyStats(요약 한 줄)를 다시 계산합니다.
+워커가 여러 개여도 플레이어 테이블에서 합쳐지므로 참여자/정답자 수가 중복 집계되지 않습니다.
+시도 횟수는 서버가 본 단어(요청 + 브라우저에서 채점했다고 보고된 이웃 단어)만 셉니다.
+"""
+
+import collections
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from .models import KkomantleDailyStats, KkomantlePlayerDay
+
+logger = logging.getLogger(__name__)
+
+# 요약 행에 남길 오답 단어 수 (그 밖의 단어는 합치면서 잘려나가므로 근사치)
+TOP_WRONG_GUESSES = 100
+_QUERY_CHUNK = 500
+
+_lock = threading.Lock()
+_buffer = {}  # date -> {'players': {player: [시도 수, 맞혔는지, 클라이언트 시도 횟수]}, 'wrong': Counter}
+_flusher = {'pid': None, 'thread': None}
+
+
+def player_key(identity):
+    """CSRF 쿠키/IP 같은 식별자를 그대로 저장하지 않도록 HMAC 으로 줄입니다."""
+    return hmac.new(settings.SECRET_KEY.encode(), identity.encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def record_guess(day, player, word, correct, attempts=None, local_words=()):
+    """
+    attempts: 클라이언트가 보낸 누적 시도 횟수. 맞혔을 때만 쓰고, 저장할 때 서버가 센 횟수를 넘지 않게 자릅니다.
+    local_words: 지난 요청 이후 브라우저에서 채점한 이웃 단어들 (정답이 아니므로 오답으로 셉니다)
+    """
+    with _lock:
+        bucket = _buffer.setdefault(day, {'players': {}, 'wrong': collections.Counter()})
+        entry = bucket['players'].setdefault(player, [0, False, None])
+        entry[0] += 1 + len(local_words)
+        bucket['wrong'].update(local_words)
+        if correct:
+            if not entry[1]:
+                entry[1], entry[2] = True, attempts
+        else:
+            bucket['wrong'][word] += 1
+    _ensure_flusher()
+
+
+def _ensure_flusher():
+    interval = getattr(settings, 'KKOMANTLE_STATS_FLUSH_INTERVAL', 30)
+    if interval <= 0 or _flusher['pid'] == os.getpid():
+        return
+    with _lock:
+        if _flusher['pid'] == os.getpid():
+            return
+        # fork 된 워커에는 부모의 스레드가 없으므로 pid 가 바뀌면 새로 띄웁니다.
+        thread = threading.Thread(target=_flush_loop, args=(interval,), name='kkomantle-stats-flush', daemon=True)
+        thread.start()
+        _flusher.update(pid=os.getpid(), thread=thread)
+
+
+def _flush_loop(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception:
+            logger.exception("꼬맨틀 통계 저장 실패")
+        finally:
+            connection.close()
+
+
+def _drain():
+    global _buffer
+    with _lock:
+        drained, _buffer = _buffer, {}
+    return drained
+
+
+def _restore(day, bucket):
+    # 저장에 실패한 버퍼를 다음 주기에 다시 시도하도록 되돌립니다.
+    with _lock:
+        current = _buffer.setdefault(day, {'players': {}, 'wrong': collections.Counter()})
+        for player, (attempts, solved, claimed) in bucket['players'].items():
+            entry = current['players'].setdefault(player, [0, False, None])
+            entry[0] += attempts
+            if solved and not entry[1]:
+                entry[1], entry[2] = True, claimed
+        current['wrong'].update(bucket['wrong'])
+
+
+def flush():
+    """버퍼를 DB 에 합칩니다. (gunicorn worker_exit 과 테스트에서는 직접 호출)"""
+    for day, bucket in _drain().items():
+        try:
+            _write_day(day, bucket)
+        except Exception:
+            _restore(day, bucket)
+            raise
+
+
+def _write_day(day, bucket):
+    players = bucket['players']
+    keys = list(players)
+    with transaction.atomic():
+        # 요약 행을 먼저 잠가서 같은 날짜를 합치는 워커들을 한 줄로 세웁니다.
+        # (SQLite 는 select_for_update 를 무시하지만, 첫 문장이 INSERT 라 여기서 DB 쓰기 잠금을 잡습니다)
+        KkomantleDailyStats.objects.bulk_create([KkomantleDailyStats(date=day)], ignore_conflicts=True)
+        stats = KkomantleDailyStats.objects.select_for_update().get(date=day)
+
+        KkomantlePlayerDay.objects.bulk_create(
+            [KkomantlePlayerDay(date=day, player=key) for key in keys],
+            ignore_conflicts=True,
+        )
+        changed = []
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            rows = KkomantlePlayerDay.objects.filter(date=day, player__in=keys[start:start + _QUERY_CHUNK])
+            for row in rows:
+                attempts, solved, claimed = players[row.player]
+                # 버퍼에는 이번 주기에 이 워커가 본 횟수만 있으므로 더합니다.
+                row.attempts += attempts
+                if solved and row.solved_attempts is None:
+                    # 클라이언트가 보낸 횟수는 서버가 센 횟수를 넘을 수 없음
+                    # (다른 워커가 아직 합치지 않은 시도가 있으면 조금 작게 잡힐 수 있음)
+                    row.solved_attempts = min(claimed or row.attempts, row.attempts)
+                changed.append(row)
+        KkomantlePlayerDay.objects.bulk_update(changed, ['attempts', 'solved_attempts'], batch_size=_QUERY_CHUNK)
+
+        day_rows = KkomantlePlayerDay.objects.filter(date=day)
+        totals = day_rows.aggregate(players=Count('id'), solvers=Count('solved_attempts'), guesses=Sum('attempts'))
+        histogram = (
+            day_rows.filter(solved_attempts__isnull=False)
+            .values_list('solved_attempts')
+            .annotate(count=Count('id'))
+        )
+
+        wrong = collections.Counter(stats.wrong_guesses)
+        wrong.update(bucket['wrong'])
+        stats.players = totals['players']
+        stats.solvers = totals['solvers']
+        stats.guesses = totals['guesses'] or 0
+        stats.solve_histogram = {str(attempts): count for attempts, count in histogram}
+        stats.wrong_guesses = dict(wrong.most_common(TOP_WRONG_GUESSES))
+        stats.save()
+
+
+def daily_summary(day):
+    stats = KkomantleDailyStats.objects.filter(date=day).first()
+    if stats is None:
+        return {'date': day.isoformat(), 'players': 0, 'solvers': 0, 'guesses': 0,
+                'solve_histogram': {}, 'top_wrong_guesses': []}
+    wrong = collections.Counter(stats.wrong_guesses).most_common(10)
+    return {
+        'date': day.isoformat(),
+        'players': stats.players,
+        'solvers': stats.solvers,
+        'guesses': stats.guesses,
+        'solve_histogram': stats.solve_histogram,
+        'top_wrong_guesses': wrong,
+    }
@@ -1,16 +1,39 @@
+import gzip
+import io
 import json
+import os
+import signal
+import subprocess
+import tempfile
+import time
+import brotli
 import requests
 from unittest.mock import patch
-from django.core.cache import cache
-from django.test import TestCase, override_settings
+from asgiref.sync import async_to_sync
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.conf import settings
+from django.test import AsyncRequestFactory, LiveServerTestCase, TestCase, override_settings
 from django.urls import reverse
+from . import embeddings, log, metrics, middleware, stats, views
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .concurrency import BoundedExecutor
+from .fake_wordpress import FakeWordPress
+from .management.commands.bench import build_synthetic_model
+from .management.commands.loadtest import process_tree_rss_kb
 from .models import GameRecord
 
 
-@override_settings(SECURE_SSL_REDIRECT=False)
+# 테스트에서는 collectstatic 없이 템플릿을 렌더링하므로 manifest 저장소를 쓰지 않습니다.
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
 class CoreViewTests(TestCase):
     def setUp(self):
         cache.clear()
+        caches[settings.PAGE_CACHE_ALIAS].clear()
 
     @patch('core.views.fetch_wp_json')
     def test_post_detail_returns_404_when_wp_fetch_fails(self, mock_fetch_wp_json):
@@ -99,3 +122,580 @@ class CoreViewTests(TestCase):
         self.assertEqual(first.status_code, 200)
         self.assertEqual(second.status_code, 429)
         self.assertEqual(GameRecord.objects.filter(game_type='2048').count(), 1)
+
+    def test_leaderboard_returns_304_until_a_record_is_added(self):
+        url = reverse('api_2048_rank')
+        first = self.client.get(url)
+        etag = first['ETag']
+
+        self.assertIn('no-cache', first['Cache-Control'])
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        self.client.post(
+            url,
+            data=json.dumps({'player_name': 'tester', 'score': 512}),
+            content_type='application/json'
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(changed.json()['ranking'], [{'name': 'tester', 'score': 512}])
+
+    def test_leaderboard_etag_changes_when_another_worker_adds_a_record(self):
+        url = reverse('api_2048_rank')
+        etag = self.client.get(url)['ETag']
+
+        # 다른 워커가 저장한 기록: 이 프로세스의 캐시는 건드리지 않음
+        GameRecord.objects.create(game_type='2048', player_name='other', score=64)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_static_pages_send_cache_headers_and_revalidate(self):
+        lobby = self.client.get(reverse('games_lobby'))
+        self.assertIn('public', lobby['Cache-Control'])
+        self.assertIn('max-age=', lobby['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('games_lobby'), HTTP_IF_NONE_MATCH=lobby['ETag']).status_code, 304)
+
+        # 첫 방문은 CSRF 쿠키를 받아야 하므로 ETag 없이 렌더링
+        first = self.client.get(reverse('game_2048'))
+        self.assertFalse(first.has_header('ETag'))
+        self.assertIn('private', first['Cache-Control'])
+        repeat = self.client.get(reverse('game_2048'))
+        self.assertEqual(
+            self.client.get(reverse('game_2048'), HTTP_IF_NONE_MATCH=repeat['ETag']).status_code, 304
+        )
+
+    @patch('core.views.fetch_wp_json')
+    def test_blog_page_is_cached_and_compressed_once_per_version(self, mock_fetch_wp_json):
+        mock_fetch_wp_json.return_value = (
+            {'id': 7, 'date': '2026-10-01T00:00:00', 'categories': [],
+             'title': {'rendered': '압축 테스트'}, 'content': {'rendered': '<p>본문</p>' * 500}},
+            {},
+        )
+        url = reverse('post_detail', args=[7])
+        with patch('core.middleware.compress', wraps=middleware.compress) as mock_compress:
+            plain = self.client.get(url)
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br;q=0.9')
+            repeat = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+            gzipped = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+
+        self.assertEqual(mock_fetch_wp_json.call_count, 1)
+        self.assertEqual(mock_compress.call_count, 2)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+        self.assertEqual((first['Content-Encoding'], gzipped['Content-Encoding']), ('br', 'gzip'))
+        self.assertEqual(brotli.decompress(repeat.content), plain.content)
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertLess(len(first.content), len(plain.content))
+        self.assertEqual(first['ETag'], 'W/' + plain['ETag'])
+
+        not_modified = self.client.get(url, HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        body = metrics.registry.render()
+        self.assertIn('lbplate_cache_requests_total{cache="blog_page",result="hit"}', body)
+        self.assertIn('lbplate_cache_requests_total{cache="compressed",result="hit"}', body)
+
+    @override_settings(ALLOWED_HOSTS=['monosaccharide180.com', '100.74.55.70'])
+    @patch('core.views.fetch_wp_json', return_value=([], {'X-WP-TotalPages': '1'}))
+    def test_blog_page_cache_is_per_host_and_skips_unknown_query_params(self, mock_fetch_wp_json):
+        url = reverse('blog_home')
+        self.client.get(url, HTTP_HOST='100.74.55.70')
+        public = self.client.get(url, HTTP_HOST='monosaccharide180.com')
+        self.assertContains(public, 'href="http://monosaccharide180.com/blog/"')
+        self.assertNotContains(public, '100.74.55.70')
+
+        calls = mock_fetch_wp_json.call_count
+        for n in range(3):
+            self.client.get(f"{url}?x={n}", HTTP_HOST='monosaccharide180.com')
+        self.client.get(url, HTTP_HOST='monosaccharide180.com')
+        # ?x= 요청은 매번 렌더링하고(글 목록 + 카테고리), 캐시된 /blog/ 는 그대로 재사용
+        self.assertEqual(mock_fetch_wp_json.call_count, calls + 3 * 2)
+
+        pages = caches[settings.PAGE_CACHE_ALIAS]
+        key = views.BLOG_PAGE_KEY.format(views.hashlib.sha1(b'http://monosaccharide180.com/blog/?').hexdigest())
+        self.assertIsNotNone(pages.get(key))
+        self.assertIsNone(cache.get(key))
+        # 두 host 의 /blog/ 만 저장되고 ?x= 요청은 페이지도 압축본도 남기지 않음
+        self.assertEqual(len(pages._cache), 2)
+        for n in range(3):
+            lobby = self.client.get(
+                f"{reverse('games_lobby')}?r={n}", HTTP_ACCEPT_ENCODING='gzip', HTTP_HOST='monosaccharide180.com'
+            )
+            self.assertEqual(lobby['Content-Encoding'], 'gzip')
+            self.client.get(
+                f"{reverse('api_2048_rank')}?x={n}", HTTP_ACCEPT_ENCODING='gzip', HTTP_HOST='monosaccharide180.com'
+            )
+        self.assertEqual(len(pages._cache), 2)
+
+    def test_private_and_small_responses_are_not_compressed(self):
+        self.client.get(reverse('game_2048'))
+        game = self.client.get(reverse('game_2048'), HTTP_ACCEPT_ENCODING='gzip')
+        rank = self.client.get(reverse('api_2048_rank'), HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(game.has_header('Content-Encoding'))
+        self.assertFalse(rank.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', rank['Vary'])
+
+
+@override_settings(KKOMANTLE_POST_RATE_LIMIT=0, KKOMANTLE_STATS_FLUSH_INTERVAL=0)
+class KkomantleModelTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        stats._drain()
+        synthetic = build_synthetic_model(vocab_size=4000, dim=16, seed=7)
+        for patcher in (
+            patch.object(embeddings.registry, 'active', embeddings.ModelVersion('synthetic', synthetic)),
+            # 테스트 중 매니페스트 감시 스레드를 띄우지 않음
+            patch.object(embeddings.registry, '_watcher_pid', os.getpid()),
+            patch.dict(views.TODAY_CACHE, {'date': None, 'secret': None, 'version': None, 'top1000': [], 'neighbours': {}, 'artifact': None}),
+            patch.dict(views._pinned_secret, {'date': None, 'version': None, 'word': None}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_neighbour_table_matches_server_scoring_without_the_answer(self):
+        response = self.client.get(reverse('api_kkomantle_neighbours'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        table = json.loads(response.content)
+        self.assertEqual(len(table['hashes']), 3000)
+
+        secret = views.get_daily_word()
+        self.assertNotIn(views.hash_neighbour(table['salt'], secret), table['hashes'])
+
+        neighbour = views.TODAY_CACHE['top1000'][41]
+        index = table['hashes'].index(views.hash_neighbour(table['salt'], neighbour))
+        guess = self.client.post(
+            reverse('api_kkomantle_guess'),
+            data=json.dumps({'word': neighbour}),
+            content_type='application/json'
+        ).json()
+        self.assertEqual((table['scores'][index], index + 1), (guess['score'], guess['rank']))
+
+        repeat = self.client.get(reverse('api_kkomantle_neighbours'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+
+    def guess(self, word, ip, attempts=None, local_words=None):
+        payload = {'word': word}
+        if attempts is not None:
+            payload['attempts'] = attempts
+        if local_words is not None:
+            payload['local_words'] = local_words
+        return self.client.post(
+            reverse('api_kkomantle_guess'), data=json.dumps(payload),
+            content_type='application/json', REMOTE_ADDR=ip
+        ).json()
+
+    def test_daily_stats_are_buffered_and_merged_per_player(self):
+        secret = views.get_daily_word()
+        views.get_top1000(secret)
+        wrong = next(
+            word for word in views.get_active_model().index_to_key
+            if word != secret and word not in views.TODAY_CACHE['neighbours']
+        )
+        neighbours = views.TODAY_CACHE['top1000'][:2]
+
+        self.guess(wrong, '10.0.0.1')
+        # 브라우저에서 채점한 이웃 단어는 다음 요청에 실려 오고, 이웃이 아닌 단어는 무시
+        self.guess(wrong, '10.0.0.1', local_words=neighbours + [neighbours[0], wrong, secret])
+        self.assertEqual(self.guess(secret, '10.0.0.1', attempts=5)['result'], 'correct')
+        self.guess(wrong, '10.0.0.2')
+        self.assertEqual(self.client.get(reverse('api_kkomantle_stats')).json()['players'], 0)
+
+        stats.flush()
+        # 다른 워커가 같은 플레이어의 기록을 나중에 합쳐도 정답 기록은 한 번만 남음
+        self.guess(secret, '10.0.0.1', attempts=6)
+        # 서버가 본 것보다 많은 시도 횟수를 보내도 서버가 센 횟수로 잘림
+        self.guess(secret, '10.0.0.3', attempts=40)
+        stats.flush()
+
+        summary = self.client.get(reverse('api_kkomantle_stats')).json()
+        self.assertEqual((summary['players'], summary['solvers'], summary['guesses']), (3, 2, 8))
+        self.assertEqual(summary['solve_histogram'], {'5': 1, '1': 1})
+        self.assertEqual(summary['top_wrong_guesses'][0], [wrong, 3])
+        self.assertEqual(sorted(summary['top_wrong_guesses'][1:]), sorted([word, 1] for word in neighbours))
+
+    def test_model_swap_keeps_todays_secret_and_rankings(self):
+        secret = views.get_daily_word()
+        rankings = list(views.get_top1000(secret))
+        previous = embeddings.registry.active
+
+        # 같은 단어에 벡터를 뒤섞은 새 버전 (후보 순서가 달라 새로 뽑으면 다른 정답이 나옴)
+        replacement = previous.model.__class__(vector_size=16)
+        replacement.add_vectors(list(reversed(previous.model.index_to_key)), previous.model.vectors)
+        with tempfile.TemporaryDirectory() as model_dir, \
+                override_settings(WORD2VEC_MODEL_MANIFEST=os.path.join(model_dir, 'active.json')):
+            model_path = os.path.join(model_dir, 'v2.vec')
+            replacement.save_word2vec_format(model_path)
+            pidfile = os.path.join(model_dir, 'gunicorn.pid')
+            with open(pidfile, 'w') as pid_file:
+                pid_file.write('4242')
+            with patch('core.management.commands.swap_model.os.kill') as mock_kill:
+                call_command('swap_model', model_path, '--name', 'v2', '--pidfile', pidfile, stdout=io.StringIO())
+            # 마스터에 HUP -> gunicorn on_reload 훅이 마스터에서 check_manifest() 실행
+            mock_kill.assert_called_once_with(4242, signal.SIGHUP)
+
+            self.assertEqual(embeddings.registry.check_manifest().name, 'v2')
+            self.assertIsNone(embeddings.registry.check_manifest())
+
+        self.assertIsNot(embeddings.registry.active, previous)
+        self.assertEqual(views.get_daily_word(), secret)
+        self.assertEqual(views.get_top1000(secret), rankings)
+
+        # 교체 뒤 새로 fork 된 워커: 로컬 순위표 없이 시작해도 고정된 순위표를 씀
+        views.TODAY_CACHE.update(date=None, secret=None, top1000=[], neighbours={}, artifact=None)
+        views._pinned_secret.update(date=None, version=None, word=None)
+        self.assertEqual(views.get_daily_word(), secret)
+        self.assertEqual(views.get_top1000(secret), rankings)
+        self.assertTrue(views.neighbours_etag(None).endswith('-synthetic'))
+        body = metrics.registry.render()
+        self.assertIn('lbplate_model_active{version="v2"} 1', body)
+        self.assertIn('lbplate_model_memory_bytes{version="v2"}', body)
+        self.assertIn('lbplate_model_swaps_total{outcome="activated",version="v2"}', body)
+
+    def test_model_swap_is_rejected_when_todays_secret_is_missing(self):
+        secret = views.get_daily_word()
+        previous = embeddings.registry.active
+        words = [w for w in previous.model.index_to_key if w != secret]
+        stripped = embeddings.ModelVersion('stripped', previous.model.__class__(vector_size=16))
+        stripped.model.add_vectors(words, previous.model[words])
+        stripped.candidates = embeddings.build_candidates(stripped.model)
+
+        with self.assertRaises(embeddings.ModelValidationError):
+            embeddings.registry.activate(stripped)
+        self.assertIs(embeddings.registry.active, previous)
+
+    def guess_async(self, word):
+        request = AsyncRequestFactory().post(
+            reverse('api_kkomantle_guess'), data=json.dumps({'word': word}), content_type='application/json'
+        )
+        return async_to_sync(views.api_kkomantle_guess_async)(request)
+
+    def test_async_guess_matches_sync_scoring_and_sheds_load_when_saturated(self):
+        secret = views.get_daily_word()
+        neighbour = views.get_top1000(secret)[10]
+
+        response = self.guess_async(neighbour)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), self.guess(neighbour, '10.0.0.3'))
+
+        executor = BoundedExecutor('test', max_workers=1, max_pending=0)
+        executor.slots.acquire()
+        with patch.object(views, 'embedding_executor', executor), override_settings(KKOMANTLE_RETRY_AFTER=3):
+            saturated = self.guess_async(neighbour)
+        self.assertEqual(saturated.status_code, 503)
+        self.assertEqual(saturated['Retry-After'], '3')
+        self.assertIn('lbplate_executor_rejections_total{executor="test"}', metrics.registry.render())
+
+    def test_neighbour_table_is_unavailable_without_model(self):
+        with patch.object(embeddings.registry, 'active', None):
+            response = self.client.get(reverse('api_kkomantle_neighbours'))
+        self.assertEqual(response.status_code, 404)
+
+
+class StaticAssetPipelineTests(TestCase):
+    def test_collectstatic_emits_hashed_and_precompressed_assets(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            with override_settings(SECURE_SSL_REDIRECT=False, STATIC_ROOT=static_root):
+                call_command('collectstatic', interactive=False, verbosity=0)
+
+                with open(os.path.join(static_root, 'staticfiles.json')) as manifest_file:
+                    hashed_lobby_css = json.load(manifest_file)['paths']['core/css/games/lobby.css']
+
+                self.assertNotEqual(hashed_lobby_css, 'core/css/games/lobby.css')
+                for suffix in ('', '.gz', '.br'):
+                    self.assertTrue(os.path.exists(os.path.join(static_root, hashed_lobby_css + suffix)))
+
+                response = self.client.get(reverse('games_lobby'))
+                self.assertContains(response, hashed_lobby_css)
+
+
+class BenchCommandTests(TestCase):
+    BENCH_OPTIONS = {
+        'vocab': 300, 'dim': 8, 'records': 20, 'iterations': 5, 'cold_iterations': 2,
+        'warmup': 1, 'isolated_db': False, 'stdout': io.StringIO(), 'stderr': io.StringIO(),
+    }
+
+    def test_bench_writes_results_json(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'bench.json')
+            call_command('bench', output=output_path, **self.BENCH_OPTIONS)
+
+            with open(output_path) as output_file:
+                results = json.load(output_file)['results']
+
+        self.assertIn('guess_scoring', results)
+        self.assertIn('leaderboard_2048', results)
+        for stats in results.values():
+            self.assertGreater(stats['ops_per_sec'], 0)
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+
+    def test_bench_fails_on_regression_past_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            baseline_path = os.path.join(tmp_dir, 'baseline.json')
+            with open(baseline_path, 'w') as baseline_file:
+                json.dump({'results': {'daily_word': {'ops_per_sec': 10 ** 12}}}, baseline_file)
+
+            with self.assertRaises(CommandError):
+                call_command('bench', only=['daily_word'], baseline=baseline_path, **self.BENCH_OPTIONS)
+
+
+class FakeWordPressTests(TestCase):
+    def test_serves_paginated_posts_and_injects_failures(self):
+        fake = FakeWordPress(port=0, post_count=5, seed=1).start()
+        try:
+            response = requests.get(f'{fake.base_url}/posts', params={'per_page': 2, 'page': 3}, timeout=5)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['X-WP-TotalPages'], '3')
+            self.assertEqual([post['id'] for post in response.json()], [1])
+
+            fake.failure_rate = 1.0
+            self.assertEqual(requests.get(f'{fake.base_url}/categories', timeout=5).status_code, 500)
+        finally:
+            fake.stop()
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_process_tree_rss_includes_children(self):
+        child = subprocess.Popen(['sleep', '30'])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+
+        self.assertGreater(process_tree_rss_kb(os.getpid()), process_tree_rss_kb(child.pid))
+        self.assertGreater(process_tree_rss_kb(child.pid), 0)
+
+    def test_loadtest_reports_per_endpoint_latency(self):
+        fake = FakeWordPress(port=0, post_count=5).start()
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir, patch('core.views.WP_BASE_URL', fake.base_url):
+                output_path = os.path.join(tmp_dir, 'load.json')
+                call_command(
+                    'loadtest', base_url=self.live_server_url, clients=2, duration=1, ramp_up=0,
+                    report_interval=1, post_ids=5, mix='blog=1,post=1,guess=1,rank=1',
+                    output=output_path, stdout=io.StringIO(), stderr=io.StringIO(),
+                )
+                with open(output_path) as output_file:
+                    endpoints = json.load(output_file)['endpoints']
+        finally:
+            fake.stop()
+
+        self.assertEqual(set(endpoints), {'blog', 'post', 'guess', 'rank'})
+        for stats in endpoints.values():
+            self.assertGreater(stats['count'], 0)
+            self.assertEqual(stats['error_rate'], 0)
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    METRICS_TOKEN='secret-token',
+)
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_metrics_endpoint_requires_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(
+                self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ').status_code, 404
+            )
+
+    @override_settings(GAME_RANK_POST_RATE_LIMIT=1, GAME_RANK_POST_RATE_WINDOW=60)
+    def test_metrics_endpoint_exposes_view_latency_and_rate_limit_rejections(self):
+        self.client.get(reverse('api_2048_rank'))
+        for _ in range(2):
+            self.client.post(
+                reverse('api_2048_rank'),
+                data=json.dumps({'player_name': 'tester', 'score': 128}),
+                content_type='application/json'
+            )
+
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret-token')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn(
+            'lbplate_http_request_duration_seconds_count{method="GET",status="200",view="api_2048_rank"}', body
+        )
+        self.assertIn('lbplate_db_queries_per_request_bucket{view="api_2048_rank",le="+Inf"}', body)
+        self.assertIn('lbplate_rate_limit_rejections_total{scope="rank_2048"}', body)
+
+    def test_forked_worker_does_not_republish_master_counters(self):
+        master = metrics.MetricsRegistry()
+        master.inc('lbplate_model_swaps_total', {'version': 'v1', 'outcome': 'activated'})
+        master.set_gauge('lbplate_model_active', 1, {'version': 'v1'})
+
+        with patch.object(metrics, 'registry', master):
+            metrics.reset_inherited()
+        snapshot = master.snapshot()
+
+        self.assertEqual(snapshot['counters'], [])
+        self.assertEqual(master.gauges, {('lbplate_model_active', (('version', 'v1'),)): 1})
+
+    def test_unknown_http_methods_share_one_label(self):
+        for method in ('FOOBAR', 'X-RANDOM-1'):
+            self.client.generic(method, reverse('api_2048_rank'))
+
+        body = metrics.registry.render()
+        self.assertIn('lbplate_http_request_duration_seconds_count{method="other"', body)
+        self.assertNotIn('FOOBAR', body)
+
+    def test_collect_merges_worker_snapshots_and_archives_dead_workers(self):
+        worker = metrics.MetricsRegistry()
+        worker.inc('lbplate_rate_limit_rejections_total', {'scope': 'test'}, 3)
+        worker.observe('lbplate_wp_request_duration_seconds', 0.2, {'endpoint': 'test', 'outcome': 'ok'})
+
+        with tempfile.TemporaryDirectory() as metrics_dir, override_settings(METRICS_MULTIPROC_DIR=metrics_dir):
+            with open(os.path.join(metrics_dir, '999999.json'), 'w') as worker_file:
+                json.dump(worker.snapshot(), worker_file)
+            metrics.mark_process_dead(999999)
+
+            self.assertEqual(os.listdir(metrics_dir), ['archive.json'])
+            body = metrics.collect().render()
+
+        self.assertIn('lbplate_rate_limit_rejections_total{scope="test"} 3', body)
+        self.assertIn(
+            'lbplate_wp_request_duration_seconds_bucket{endpoint="test",outcome="ok",le="0.25"} 1', body
+        )
+
+
+class CircuitBreakerTests(TestCase):
+    def test_opens_after_threshold_and_closes_after_background_probe(self):
+        probe_calls = []
+        breaker = CircuitBreaker(
+            'test', failure_threshold=2, reset_timeout=0.01, probe=lambda: probe_calls.append(1) or True
+        )
+
+        for _ in range(2):
+            with self.assertRaises(requests.Timeout), breaker.guard():
+                raise requests.Timeout('slow')
+        self.assertEqual(breaker.state, 'open')
+
+        with self.assertRaises(CircuitOpenError), breaker.guard():
+            self.fail('guarded call must not run while the circuit is open')
+
+        deadline = time.monotonic() + 2
+        while breaker.state != 'closed' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(breaker.state, 'closed')
+        self.assertTrue(probe_calls)
+
+    def test_non_failure_exceptions_do_not_open_circuit(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, is_failure=lambda exc: False)
+
+        with self.assertRaises(ValueError), breaker.guard():
+            raise ValueError('not found')
+
+        self.assertEqual(breaker.state, 'closed')
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+class WordPressCircuitTests(TestCase):
+    def setUp(self):
+        views.wp_circuit.reset()
+        self.addCleanup(views.wp_circuit.reset)
+
+    @patch('core.views.requests.get', side_effect=requests.Timeout('wp hang'))
+    def test_blog_fails_fast_once_wordpress_circuit_opens(self, mock_get):
+        threshold = views.wp_circuit.failure_threshold
+        for _ in range(threshold):
+            self.client.get(reverse('home'))
+        self.assertEqual(mock_get.call_count, threshold)
+        self.assertEqual(views.wp_circuit.state, 'open')
+
+        response = self.client.get(reverse('blog_home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get.call_count, threshold)
+
+    @patch('core.views.requests.get')
+    def test_wordpress_404_does_not_count_as_failure(self, mock_get):
+        not_found = requests.Response()
+        not_found.status_code = 404
+        mock_get.return_value = not_found
+
+        for _ in range(views.wp_circuit.failure_threshold + 1):
+            self.client.get(reverse('post_detail', args=[1]))
+
+        self.assertEqual(views.wp_circuit.state, 'closed')
+
+
+class StructuredLoggingTests(TestCase):
+    def test_background_handler_writes_json_with_request_context(self):
+        stream = io.StringIO()
+        handler = log.BackgroundQueueHandler(stream=stream)
+        handler.addFilter(log.RequestContextFilter())
+        logger = log.logging.getLogger('core.tests.structured')
+        logger.addHandler(handler)
+        logger.propagate = False
+        self.addCleanup(logger.removeHandler, handler)
+
+        token = log._request_context.set({'request_id': 'abc123', 'view': 'home'})
+        try:
+            logger.warning("WordPress 조회 실패: %s", 'Timeout', extra={'endpoint': 'posts'})
+        finally:
+            log._request_context.reset(token)
+        handler.close()
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['msg'], 'WordPress 조회 실패: Timeout')
+        self.assertEqual(entry['request_id'], 'abc123')
+        self.assertEqual(entry['view'], 'home')
+        self.assertEqual(entry['endpoint'], 'posts')
+
+    def test_duplicate_filter_suppresses_bursts_and_reports_count(self):
+        dedupe = log.DuplicateFilter(window=60, burst=2)
+        record = lambda: log.logging.LogRecord('core', log.logging.WARNING, '', 0, "WP 실패: %s", ('x',), None)
+
+        self.assertEqual([dedupe.filter(record()) for _ in range(5)], [True, True, False, False, False])
+
+        with patch('core.log.time.monotonic', return_value=time.monotonic() + 61):
+            next_record = record()
+            self.assertTrue(dedupe.filter(next_record))
+        self.assertEqual(next_record.suppressed, 3)
+
+    def test_request_log_middleware_records_latency_and_request_id(self):
+        with self.assertLogs('core.request', level='INFO') as captured:
+            response = self.client.get(reverse('api_2048_rank'), HTTP_X_REQUEST_ID='req-42')
+
+        self.assertEqual(response['X-Request-ID'], 'req-42')
+        record = captured.records[-1]
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.path, reverse('api_2048_rank'))
+        self.assertIn('latency_ms', record.__dict__)
+        self.assertIn('db_ms', record.__dict__)
+
+    def test_every_request_gets_an_access_record_despite_dedupe(self):
+        logger = log.logging.getLogger('core')
+        # 테스트 실행 중에는 접근 로그를 끄므로(LOG_LEVEL=WARNING) 여기서만 다시 켭니다.
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(log.logging.INFO)
+        handler = logger.handlers[0]
+        burst = next(f for f in handler.filters if isinstance(f, log.DuplicateFilter)).burst
+        with patch.object(handler, 'emit') as emit:
+            for _ in range(burst + 3):
+                self.client.get(reverse('api_2048_rank'))
+
+        access = [call.args[0] for call in emit.call_args_list if call.args[0].name == 'core.request']
+        self.assertEqual(len(access), burst + 3)
+
+    async def test_middleware_stack_runs_natively_under_asgi(self):
+        with self.assertLogs('core.request', level='INFO') as captured:
+            response = await self.async_client.get(reverse('api_2048_rank'), headers={'X-Request-ID': 'req-async'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Request-ID'], 'req-async')
+        record = captured.records[-1]
+        self.assertEqual((record.status, record.path), (200, reverse('api_2048_rank')))
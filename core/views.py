@@ -3,16 +3,30 @@ import os
 import json
 import random  # [추가됨] 데일리 단어 뽑기에 필수
 import datetime # [추가됨] 날짜 처리에 필수
+import functools
+import hashlib
+import hmac
+import logging
 import re
 import time
 from django.conf import settings
-from gensim.models import KeyedVectors
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
-from django.core.cache import cache
+from django.utils.http import quote_etag
+from django.core.cache import cache, caches
+from django.db.models import Count, Max
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+from . import embeddings, metrics, stats
+from .circuit_breaker import CircuitBreaker
+from .concurrency import BoundedExecutor, Saturated
+from .middleware import page_cache_url
 from .models import GameRecord
 
+logger = logging.getLogger(__name__)
+
 # 워드프레스 API 기본 주소 설정
 WP_BASE_URL = getattr(settings, 'WP_BASE_URL', 'http://127.0.0.1:4080/wp-json/wp/v2')
 WP_REQUEST_TIMEOUT = getattr(settings, 'WP_REQUEST_TIMEOUT', 5)
@@ -21,17 +35,64 @@ WP_REQUEST_TIMEOUT = getattr(settings, 'WP_REQUEST_TIMEOUT', 5)
 MODEL_PATH = getattr(settings, 'WORD2VEC_MODEL_PATH', None)
 LIMIT = getattr(settings, 'WORD2VEC_LIMIT', 300000)
 
-model = None
-CANDIDATES = [] # 정답 후보 단어 리스트
+# 개발용 치트 키 (오늘의 정답을 알려줌)
+CHEAT_CODE = "!b1023582"
 
+# async 채점용 스레드 풀 (실행 중 + 대기 수를 넘으면 503)
+embedding_executor = BoundedExecutor(
+    'embedding',
+    max_workers=getattr(settings, 'KKOMANTLE_COMPUTE_WORKERS', 4),
+    max_pending=getattr(settings, 'KKOMANTLE_COMPUTE_QUEUE', 64),
+)
 
-def fetch_wp_json(endpoint, params=None):
+# 오늘의 정답 고정 (모델이 교체되거나 워커가 달라도 같은 단어 유지)
+SECRET_PIN_KEY = 'kkomantle_secret:{}'
+# 오늘의 순위표도 처음 계산한 버전으로 고정 (교체 후 새로 뜬 워커도 같은 순위/점수)
+NEIGHBOURS_PIN_KEY = 'kkomantle_neighbours:{}'
+_pinned_secret = {'date': None, 'version': None, 'word': None}
+
+
+def is_wp_failure(exc):
+    """연결 실패/타임아웃/5xx 만 서킷 실패로 집계 (404 등은 정상 응답)"""
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is None or exc.response.status_code >= 500
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def probe_wp():
     response = requests.get(
-        f"{WP_BASE_URL}/{endpoint}",
-        params=params,
+        f"{WP_BASE_URL}/posts",
+        params={'per_page': 1, '_fields': 'id'},
         timeout=WP_REQUEST_TIMEOUT
     )
-    response.raise_for_status()
+    return response.status_code < 500
+
+
+# WordPress가 죽었을 때 모든 요청이 WP_REQUEST_TIMEOUT 만큼 붙잡히지 않도록 합니다.
+wp_circuit = CircuitBreaker(
+    'wordpress',
+    failure_threshold=getattr(settings, 'WP_CIRCUIT_FAILURE_THRESHOLD', 5),
+    reset_timeout=getattr(settings, 'WP_CIRCUIT_RESET_TIMEOUT', 30),
+    probe=probe_wp,
+    is_failure=is_wp_failure,
+)
+
+
+def fetch_wp_json(endpoint, params=None):
+    # 서킷이 열려 있으면 요청 없이 CircuitOpenError(RequestException)로 바로 실패
+    with wp_circuit.guard(), metrics.timed(
+        'lbplate_wp_request_duration_seconds',
+        request_key='wp',
+        endpoint=metrics.wp_endpoint_label(endpoint),
+        outcome='error',
+    ) as labels:
+        response = requests.get(
+            f"{WP_BASE_URL}/{endpoint}",
+            params=params,
+            timeout=WP_REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        labels['outcome'] = 'ok'
     return response.json(), response.headers
 
 
@@ -49,49 +110,186 @@ def get_client_ip(request):
     return request.META.get('REMOTE_ADDR', 'unknown')
 
 
+def _rate_limit_step(entry, now_ts, limit, window_seconds):
+    """(제한 여부, 저장할 entry, ttl) — 제한된 경우 entry 를 다시 저장하지 않습니다."""
+    if not entry or now_ts >= entry.get('reset_at', 0):
+        return False, {'count': 1, 'reset_at': now_ts + window_seconds}, window_seconds
+
+    if entry['count'] >= limit:
+        return True, None, None
+
+    entry['count'] += 1
+    return False, entry, max(1, entry['reset_at'] - now_ts)
+
+
 def is_rate_limited(request, scope, limit, window_seconds):
     if limit <= 0:
         return False
 
     ip_address = get_client_ip(request)
     cache_key = f"rate_limit:{scope}:{ip_address}"
-    now_ts = int(time.time())
-    entry = cache.get(cache_key)
+    limited, entry, ttl = _rate_limit_step(cache.get(cache_key), int(time.time()), limit, window_seconds)
+    if limited:
+        metrics.inc('lbplate_rate_limit_rejections_total', scope=scope)
+        return True
 
-    if not entry or now_ts >= entry.get('reset_at', 0):
-        cache.set(
-            cache_key,
-            {'count': 1, 'reset_at': now_ts + window_seconds},
-            timeout=window_seconds
-        )
+    cache.set(cache_key, entry, timeout=ttl)
+    return False
+
+
+async def is_rate_limited_async(request, scope, limit, window_seconds):
+    """is_rate_limited 와 같지만 cache.aget/aset 을 써서 이벤트 루프를 막지 않습니다."""
+    if limit <= 0:
         return False
 
-    if entry['count'] >= limit:
+    ip_address = get_client_ip(request)
+    cache_key = f"rate_limit:{scope}:{ip_address}"
+    limited, entry, ttl = _rate_limit_step(await cache.aget(cache_key), int(time.time()), limit, window_seconds)
+    if limited:
+        metrics.inc('lbplate_rate_limit_rejections_total', scope=scope)
         return True
 
-    entry['count'] += 1
-    ttl = max(1, entry['reset_at'] - now_ts)
-    cache.set(cache_key, entry, timeout=ttl)
+    await cache.aset(cache_key, entry, timeout=ttl)
     return False
 
+
 # ==========================================
-# 1. AI 모델 로딩 (서버 시작 시 1회 실행)
+# 조건부 GET (ETag / 304)
 # ==========================================
-if MODEL_PATH and os.path.exists(MODEL_PATH):
-    print("⏳ AI 모델 로딩 중... (잠시만 기다려주세요)")
-    try:
-        model = KeyedVectors.load_word2vec_format(MODEL_PATH, binary=False, limit=LIMIT)
-        print("✅ 모델 로딩 완료!")
-        
-        # [오늘의 단어 후보군 만들기]
-        # 상위 3000개 중 2글자 이상, 한글로만 된 단어 필터링
-        raw_candidates = model.index_to_key[:3000]
-        CANDIDATES = [w for w in raw_candidates if len(w) >= 2 and w.replace('_', '').isalpha()]
-        
-    except Exception as e:
-        print(f"❌ 모델 로딩 실패: {e}")
-else:
-    print("🚀 개발 모드 또는 모델 파일 없음: AI 기능을 제한적으로 실행합니다.")
+BLOG_PAGE_KEY = 'blog_page:{}'
+PAGE_CACHE_MAX_AGE = getattr(settings, 'PAGE_CACHE_MAX_AGE', 300)
+_build_id = None
+
+
+def get_leaderboard_version(game_type):
+    """
+    오늘 기록의 마지막 id + 개수. 워커별 캐시가 아니라 DB 에서 읽으므로 다른 워커가 추가한 기록도
+    바로 반영됩니다. (game_type, created_at 인덱스만으로 계산)
+    """
+    version = todays_records(game_type).aggregate(last=Max('id'), count=Count('id'))
+    return f"{version['last'] or 0}.{version['count']}"
+
+
+def leaderboard_etag(game_type):
+    """오늘 기록이 바뀔 때만 달라지는 버전 + 날짜로 ETag 생성 (응답 본문을 만들거나 해시하지 않음)"""
+    def etag_func(request, *args, **kwargs):
+        return f"{game_type}-{timezone.localdate().isoformat()}-{get_leaderboard_version(game_type)}"
+    return etag_func
+
+
+def todays_records(game_type):
+    # created_at__date 는 DB 함수로 변환되어 인덱스를 못 타므로 범위 조건으로 조회
+    start = timezone.make_aware(datetime.datetime.combine(timezone.localdate(), datetime.time.min))
+    return GameRecord.objects.filter(
+        game_type=game_type,
+        created_at__gte=start,
+        created_at__lt=start + datetime.timedelta(days=1),
+    )
+
+
+def get_build_id():
+    """템플릿과 정적 파일 매니페스트가 바뀔 때(=배포)만 달라지는 값"""
+    global _build_id
+    if _build_id is None:
+        digest = hashlib.sha1()
+        sources = []
+        for root, _, files in os.walk(os.path.join(os.path.dirname(__file__), 'templates')):
+            sources.extend(os.path.join(root, name) for name in files)
+        sources.append(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'))
+        for path in sorted(sources):
+            if os.path.exists(path):
+                with open(path, 'rb') as source:
+                    digest.update(source.read())
+        _build_id = digest.hexdigest()[:16]
+    return _build_id
+
+
+def page_etag(request, *args, **kwargs):
+    if settings.DEBUG:
+        return None
+    return get_build_id()
+
+
+def csrf_page_etag(request, *args, **kwargs):
+    """
+    CSRF 토큰이 들어간 게임 화면: 쿠키 값까지 ETag 에 포함합니다.
+    쿠키가 없으면(첫 방문) ETag 없이 렌더링해서 새 토큰과 쿠키를 내려줍니다.
+    """
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    if settings.DEBUG or not csrf_cookie:
+        return None
+    cookie_hash = hashlib.sha1(csrf_cookie.encode()).hexdigest()[:12]
+    return f"{get_build_id()}-{cookie_hash}"
+
+
+def static_page(view):
+    """공개 정적 화면: 짧게 캐시 후 ETag 로 재검증"""
+    return cache_control(public=True, max_age=PAGE_CACHE_MAX_AGE)(condition(etag_func=page_etag)(view))
+
+
+def game_page(view):
+    """CSRF 토큰이 들어간 화면: 브라우저에만 저장하고 매번 재검증 (대부분 304)"""
+    return cache_control(private=True, no_cache=True)(condition(etag_func=csrf_page_etag)(view))
+
+
+def blog_page(view):
+    """
+    워드프레스 글을 보여주는 공개 화면: 렌더링 결과를 BLOG_PAGE_CACHE_TIMEOUT 초 동안 공유 캐시에 두고
+    본문 해시를 ETag 로 씁니다. (CompressionMiddleware 도 이 ETag 로 압축본을 캐시)
+    200 이 아니거나 no-store 로 표시된 응답(워드프레스 장애)은 저장하지 않습니다.
+
+    키는 page_cache_url(scheme/host/경로 + 알려진 파라미터)이고, 모르는 파라미터가 있으면 캐시를 건너뜁니다.
+    속도 제한 카운터 등이 밀려나지 않도록 별도 캐시(PAGE_CACHE_ALIAS)를 씁니다.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timeout = getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 60)
+        if request.method not in ('GET', 'HEAD') or timeout <= 0:
+            return view(request, *args, **kwargs)
+        url = page_cache_url(request)
+        if url is None:
+            return view(request, *args, **kwargs)
+
+        page_cache = caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+        key = BLOG_PAGE_KEY.format(hashlib.sha1(url.encode()).hexdigest())
+        entry = page_cache.get(key)
+        if entry is None:
+            metrics.inc('lbplate_cache_requests_total', cache='blog_page', result='miss')
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or 'no-store' in response.get('Cache-Control', ''):
+                return response
+            etag = quote_etag(hashlib.sha1(response.content).hexdigest()[:16])
+            page_cache.set(key, (etag, response['Content-Type'], response.content), timeout)
+        else:
+            metrics.inc('lbplate_cache_requests_total', cache='blog_page', result='hit')
+            etag, content_type, content = entry
+            response = HttpResponse(content, content_type=content_type)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=timeout)
+        return get_conditional_response(request, etag=etag, response=response)
+    return wrapper
+
+# ==========================================
+# 1. AI 모델 로딩 (서버 시작 시 1회 실행, 이후 교체는 core/embeddings.py)
+# ==========================================
+def get_active_model():
+    version = embeddings.registry.current()
+    return version.model if version else None
+
+
+def pinned_secret_words():
+    # 새 모델 버전은 오늘의 정답을 알고 있어야 교체됩니다.
+    return [cache.get(SECRET_PIN_KEY.format(datetime.date.today().isoformat()))]
+
+
+embeddings.registry.required_words = pinned_secret_words
+
+try:
+    if not embeddings.registry.load_initial(MODEL_PATH, LIMIT):
+        logger.warning("개발 모드 또는 모델 파일 없음: AI 기능을 제한적으로 실행합니다.")
+except Exception:
+    logger.exception("AI 모델 로딩 실패")
 
 
 # ==========================================
@@ -101,160 +299,361 @@ def get_daily_word():
     """
     오늘 날짜를 기준으로 정답 단어를 결정합니다.
     같은 날짜에는 누가 접속해도 항상 같은 단어가 나옵니다.
+    처음 뽑은 단어는 캐시에 고정해서, 모델을 교체해도 오늘의 정답은 바뀌지 않습니다.
     """
+    version = embeddings.registry.current()
     # 모델이나 후보군이 없으면 테스트용 단어 리턴
-    if not model or not CANDIDATES:
+    if version is None or not version.candidates:
         return "세포"
 
     # 1. 오늘 날짜 가져오기 (예: '2026-02-12')
     today_str = datetime.date.today().isoformat()
-    
-    # 2. 날짜를 '랜덤 시드'로 설정
-    # 이렇게 하면 오늘 하루 동안은 random이 항상 같은 순서로 작동합니다.
-    rng = random.Random(today_str)
-    
-    # 3. 후보군에서 하나 뽑기
-    secret_word = rng.choice(CANDIDATES)
+    if _pinned_secret['date'] == today_str and _pinned_secret['version'] is version:
+        return _pinned_secret['word']
+
+    # 2. 이미 고정된 정답이 있고 지금 모델이 아는 단어면 그대로 사용
+    pin_key = SECRET_PIN_KEY.format(today_str)
+    secret_word = cache.get(pin_key)
+    if secret_word is None or secret_word not in version.model.key_to_index:
+        # 3. 날짜를 '랜덤 시드'로 후보군에서 하나 뽑기
+        # 이렇게 하면 오늘 하루 동안은 random이 항상 같은 순서로 작동합니다.
+        chosen = random.Random(today_str).choice(version.candidates)
+        if secret_word is None and not cache.add(pin_key, chosen, timeout=2 * 24 * 3600):
+            chosen = cache.get(pin_key, chosen)
+        elif secret_word is not None:
+            cache.set(pin_key, chosen, timeout=2 * 24 * 3600)
+        secret_word = chosen
+
+    _pinned_secret.update(date=today_str, version=version, word=secret_word)
     return secret_word
 
 # 정답 단어와 유사한 상위 1000개 단어 캐싱
 TODAY_CACHE = {
     'date': None,
     'secret': None,
-    'top1000': []
+    'top1000': [],
+    'version': None,  # 순위표를 계산한 모델 버전
+    'neighbours': {},  # 단어 -> (점수, 순위)
+    'artifact': None,  # 클라이언트 채점용 테이블 (salt, JSON bytes, 만료 시각)
 }
 
+NEIGHBOUR_HASH_LENGTH = 12
+
+
 def get_top1000(secret_word):
     """정답 단어의 유사도 순위표를 구하거나 캐시에서 가져옴"""
     today_str = datetime.date.today().isoformat()
     
     # 이미 구해놓은 게 오늘 거라면 그거 사용
     if TODAY_CACHE['date'] == today_str and TODAY_CACHE['secret'] == secret_word:
+        metrics.inc('lbplate_cache_requests_total', cache='kkomantle_top', result='hit')
         return TODAY_CACHE['top1000']
-    
-    # 아니면 새로 계산 (하루에 한 번만 실행됨)
-    if model:
+    metrics.inc('lbplate_cache_requests_total', cache='kkomantle_top', result='miss')
+
+    # 다른 워커(또는 교체 전 모델)가 오늘 이미 만든 순위표가 있으면 그대로 씁니다.
+    pin_key = NEIGHBOURS_PIN_KEY.format(today_str)
+    pinned = cache.get(pin_key)
+    if pinned is None or pinned['secret'] != secret_word:
+        # 아니면 새로 계산 (하루에 한 번만 실행됨)
+        version = embeddings.registry.current()
+        if version is None:
+            return []
         try:
             # most_similar는 (단어, 점수) 튜플 리스트를 줌
-            top_list = [w[0] for w in model.most_similar(secret_word, topn=3000)]
-            
-            # 캐시 업데이트
-            TODAY_CACHE['date'] = today_str
-            TODAY_CACHE['secret'] = secret_word
-            TODAY_CACHE['top1000'] = top_list
-            return top_list
+            with metrics.timed('lbplate_embedding_duration_seconds', request_key='embedding', operation='most_similar'):
+                similar = version.model.most_similar(secret_word, topn=3000)
         except:
             return []
-    return []
+        computed = {
+            'secret': secret_word,
+            'version': version.name,
+            'neighbours': [(word, round(float(similarity) * 100, 2)) for word, similarity in similar],
+        }
+        if pinned is None and cache.add(pin_key, computed, timeout=2 * 24 * 3600):
+            pinned = computed
+        else:
+            # 동시에 다른 워커가 고정했으면 그 값을 쓰고, 정답이 바뀌었으면(모델에 없는 단어) 새 값으로 덮어씀
+            pinned = cache.get(pin_key)
+            if pinned is None or pinned['secret'] != secret_word:
+                cache.set(pin_key, computed, timeout=2 * 24 * 3600)
+                pinned = computed
+
+    # 캐시 업데이트
+    TODAY_CACHE['neighbours'] = {
+        word: (score, rank) for rank, (word, score) in enumerate(pinned['neighbours'], start=1)
+    }
+    TODAY_CACHE['artifact'] = None
+    TODAY_CACHE['date'] = today_str
+    TODAY_CACHE['secret'] = secret_word
+    TODAY_CACHE['version'] = pinned['version']
+    TODAY_CACHE['top1000'] = [word for word, _ in pinned['neighbours']]
+    return TODAY_CACHE['top1000']
+
+
+def get_neighbour_salt(secret_word):
+    # 날짜+정답에서 유도한 값이라 날마다 바뀌고, salt 로 정답을 역산할 수 없습니다.
+    message = f"kkomantle:{datetime.date.today().isoformat()}:{secret_word}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:16]
+
+
+def hash_neighbour(salt, word):
+    """kkomantle.js 의 hashWord() 와 같은 규칙: sha256(salt + 단어) 앞 12자리"""
+    return hashlib.sha256((salt + word).encode('utf-8')).hexdigest()[:NEIGHBOUR_HASH_LENGTH]
+
+
+def get_neighbour_artifact():
+    """
+    클라이언트 채점용 이웃 테이블 (정답 제외 상위 3000개).
+    단어는 해시로만 내려가고 배열 순서가 순위(1부터)입니다. 하루에 한 번 만들어 재사용합니다.
+    """
+    secret_word = get_daily_word()
+    if not get_top1000(secret_word):
+        return None
+
+    salt = get_neighbour_salt(secret_word)
+    artifact = TODAY_CACHE['artifact']
+    if artifact is None or artifact[0] != salt:
+        ordered = sorted(TODAY_CACHE['neighbours'].items(), key=lambda item: item[1][1])
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        expires_at = int(datetime.datetime.combine(tomorrow, datetime.time.min).timestamp())
+        payload = {
+            'date': datetime.date.today().isoformat(),
+            'salt': salt,
+            'hash_length': NEIGHBOUR_HASH_LENGTH,
+            'expires_at': expires_at,
+            'hashes': [hash_neighbour(salt, word) for word, _ in ordered],
+            'scores': [score for _, (score, _) in ordered],
+        }
+        artifact = (salt, json.dumps(payload, separators=(',', ':')).encode(), expires_at)
+        TODAY_CACHE['artifact'] = artifact
+    return artifact
+
+
+def neighbours_etag(request, *args, **kwargs):
+    if not get_active_model():
+        return None
+    secret_word = get_daily_word()
+    if not get_top1000(secret_word):
+        return None
+    # 순위표를 만든 모델 버전까지 넣어서, 다른 버전의 테이블을 캐시한 브라우저도 새로 받게 합니다.
+    return f"{get_neighbour_salt(secret_word)}-{TODAY_CACHE['version']}"
 
 
 # ==========================================
 # 3. 뷰 함수 (꼬맨틀)
 # ==========================================
 
+@game_page
 def game_kkomantle(request):
     return render(request, 'core/games/kkomantle.html')
 
-def api_kkomantle_guess(request):
-    if request.method != 'POST':
-        return JsonResponse({'result': 'error'}, status=400)
+def rate_limited_response():
+    return JsonResponse(
+        {'result': 'error', 'message': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'},
+        status=429
+    )
 
-    post_limit = getattr(settings, 'KKOMANTLE_POST_RATE_LIMIT', 45)
-    post_window = getattr(settings, 'KKOMANTLE_POST_RATE_WINDOW', 60)
-    if is_rate_limited(request, 'kkomantle_guess', post_limit, post_window):
-        return JsonResponse(
-            {'result': 'error', 'message': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'},
-            status=429
-        )
 
+def parse_guess(request):
+    """
+    요청에서 (단어, 누적 시도 횟수, 브라우저에서 채점한 단어들, None)을 꺼냅니다.
+    잘못된 요청이면 (None, None, (), 에러 응답)
+    """
     try:
         data = json.loads(request.body)
         if not isinstance(data, dict):
-            return JsonResponse({'result': 'error', 'message': '잘못된 요청 형식입니다.'}, status=400)
+            return None, None, (), JsonResponse({'result': 'error', 'message': '잘못된 요청 형식입니다.'}, status=400)
         guess = data.get('word', '').strip()
+        # 브라우저에서 채점한 단어까지 포함한 누적 시도 횟수 (통계용, 없어도 됨)
+        attempts = data.get('attempts')
+        if not isinstance(attempts, int) or not 0 < attempts <= 10000:
+            attempts = None
+        # 지난 요청 이후 브라우저에서 채점한 단어들 (통계용, 이웃 테이블보다 많을 수 없음)
+        local_words = data.get('local_words')
+        if not isinstance(local_words, list):
+            local_words = []
+        local_words = tuple(word for word in local_words[:3000] if isinstance(word, str))
     except json.JSONDecodeError:
-        return JsonResponse({'result': 'error', 'message': '잘못된 요청 형식입니다.'}, status=400)
-    except Exception as e:
-        print(f"Error: {e}")
-        return JsonResponse({'result': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
+        return None, None, (), JsonResponse({'result': 'error', 'message': '잘못된 요청 형식입니다.'}, status=400)
+    except Exception:
+        logger.exception("꼬맨틀 요청 파싱 실패")
+        return None, None, (), JsonResponse({'result': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
 
     if not guess:
-        return JsonResponse({'result': 'fail', 'message': '단어를 입력해주세요.'}, status=400)
+        return None, None, (), JsonResponse({'result': 'fail', 'message': '단어를 입력해주세요.'}, status=400)
 
     max_length = getattr(settings, 'KKOMANTLE_MAX_WORD_LENGTH', 30)
     if len(guess) > max_length:
-        return JsonResponse({'result': 'fail', 'message': f'단어 길이는 최대 {max_length}자입니다.'}, status=400)
+        return None, None, (), JsonResponse(
+            {'result': 'fail', 'message': f'단어 길이는 최대 {max_length}자입니다.'}, status=400
+        )
 
     # 개발용 치트 키는 입력 검증보다 우선 허용
-    if guess == "!b1023582":
-        secret_word = get_daily_word()
-        return JsonResponse({'result': 'fail', 'message': f"🤫 쉿! 오늘의 정답은 '{secret_word}' 입니다."})
-
     valid_pattern = re.compile(getattr(settings, 'KKOMANTLE_WORD_REGEX', r'^[0-9A-Za-z가-힣_]+$'))
-    if not valid_pattern.fullmatch(guess):
-        return JsonResponse(
+    if guess != CHEAT_CODE and not valid_pattern.fullmatch(guess):
+        return None, None, (), JsonResponse(
             {'result': 'fail', 'message': '한글/영문/숫자/밑줄(_)만 입력할 수 있어요.'},
             status=400
         )
+    return guess, attempts, local_words, None
+
 
-    # 모델 로딩 체크
+def score_guess(guess, attempts, player, local_words=()):
+    """
+    단어를 채점해서 (응답 dict, 상태 코드)를 돌려줍니다.
+    local_words 는 오늘의 이웃 단어인 것만 통계에 함께 기록합니다.
+    임베딩 계산이 들어가는 CPU 작업이라 async 뷰에서는 embedding_executor 스레드에서 실행됩니다.
+    """
+    if guess == CHEAT_CODE:
+        secret_word = get_daily_word()
+        return {'result': 'fail', 'message': f"🤫 쉿! 오늘의 정답은 '{secret_word}' 입니다."}, 200
+
+    # 모델 로딩 체크 (요청 중에 모델이 교체되어도 이 버전을 끝까지 사용)
+    model = get_active_model()
     if not model:
         # 개발 모드일 때 임시 응답
-        return JsonResponse({'result': 'success', 'score': 0, 'rank': 'Unknown'})
+        return {'result': 'success', 'score': 0, 'rank': 'Unknown'}, 200
     
     # 오늘의 정답 가져오기
     secret_word = get_daily_word()
     
     # 단어가 사전에 있는지 체크
     if guess not in model.key_to_index:
-        return JsonResponse({'result': 'fail', 'message': f"'{guess}'은(는) 제가 모르는 단어예요."})
+        return {'result': 'fail', 'message': f"'{guess}'은(는) 제가 모르는 단어예요."}, 200
     
     try:
         # 순위표 준비
-        top_list = get_top1000(secret_word)
-
-        # ★ 에러 수정 부분: float32 -> float 형변환 ★
-        similarity = model.similarity(secret_word, guess)
-        score = float(similarity) * 100 
-        score = round(score, 2)
+        get_top1000(secret_word)
 
-        # 순위 계산
-        rank = None
-        if guess == secret_word:
-            rank = 1
-        elif guess in top_list:
-            rank = top_list.index(guess) + 1
+        # 상위 3000개는 순위표에 저장된 점수 사용 (클라이언트 채점 테이블과 같은 값)
+        neighbour = TODAY_CACHE['neighbours'].get(guess) if guess != secret_word else None
+        if neighbour:
+            score, rank = neighbour
         else:
-            rank = "3000+"
+            # ★ 에러 수정 부분: float32 -> float 형변환 ★
+            with metrics.timed('lbplate_embedding_duration_seconds', request_key='embedding', operation='similarity'):
+                similarity = model.similarity(secret_word, guess)
+            score = float(similarity) * 100 
+            score = round(score, 2)
+            rank = 1 if guess == secret_word else "3000+"
 
         # 결과 반환
         result_type = 'success'
         if guess == secret_word:
             result_type = 'correct'
 
-        return JsonResponse({
+        local_words = [
+            word for word in dict.fromkeys(local_words)
+            if word != secret_word and word in TODAY_CACHE['neighbours']
+        ]
+        stats.record_guess(
+            datetime.date.today(), stats.player_key(player), guess, result_type == 'correct', attempts, local_words
+        )
+
+        return {
             'result': result_type,
             'score': score,
             'rank': rank
-        })
-    except Exception as e:
-        print(f"Error: {e}") # 터미널에 에러 로그 출력
-        return JsonResponse({'result': 'error', 'message': '서버 오류가 발생했습니다.'}, status=500)
+        }, 200
+    except Exception:
+        logger.exception("꼬맨틀 점수 계산 실패")
+        return {'result': 'error', 'message': '서버 오류가 발생했습니다.'}, 500
+
+
+def guess_player(request):
+    return request.COOKIES.get(settings.CSRF_COOKIE_NAME) or get_client_ip(request)
+
+
+def api_kkomantle_guess(request):
+    if request.method != 'POST':
+        return JsonResponse({'result': 'error'}, status=400)
+
+    post_limit = getattr(settings, 'KKOMANTLE_POST_RATE_LIMIT', 45)
+    post_window = getattr(settings, 'KKOMANTLE_POST_RATE_WINDOW', 60)
+    if is_rate_limited(request, 'kkomantle_guess', post_limit, post_window):
+        return rate_limited_response()
+
+    guess, attempts, local_words, error = parse_guess(request)
+    if error:
+        return error
+
+    payload, status = score_guess(guess, attempts, guess_player(request), local_words)
+    return JsonResponse(payload, status=status)
+
+
+async def api_kkomantle_guess_async(request):
+    """
+    ASGI 용 api_kkomantle_guess (KKOMANTLE_ASYNC_GUESS=1).
+    대기하는 동안 스레드를 잡지 않고, 채점은 크기가 제한된 풀에서 실행합니다.
+    풀이 꽉 차면 줄을 세우지 않고 503 + Retry-After 로 돌려보냅니다.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'result': 'error'}, status=400)
+
+    post_limit = getattr(settings, 'KKOMANTLE_POST_RATE_LIMIT', 45)
+    post_window = getattr(settings, 'KKOMANTLE_POST_RATE_WINDOW', 60)
+    if await is_rate_limited_async(request, 'kkomantle_guess', post_limit, post_window):
+        return rate_limited_response()
+
+    guess, attempts, local_words, error = parse_guess(request)
+    if error:
+        return error
+
+    try:
+        payload, status = await embedding_executor.run(
+            score_guess, guess, attempts, guess_player(request), local_words
+        )
+    except Saturated:
+        response = JsonResponse(
+            {'result': 'error', 'message': '지금 접속자가 많아요. 잠시 후 다시 시도해주세요.'},
+            status=503
+        )
+        response['Retry-After'] = str(getattr(settings, 'KKOMANTLE_RETRY_AFTER', 1))
+        return response
+    return JsonResponse(payload, status=status)
+
+
+@require_GET
+@cache_control(public=True, max_age=30)
+def api_kkomantle_stats(request):
+    """오늘의 참여자/정답자 수 (KKOMANTLE_STATS_FLUSH_INTERVAL 만큼 늦게 반영됨)"""
+    return JsonResponse(stats.daily_summary(datetime.date.today()))
+
+
+@require_GET
+@condition(etag_func=neighbours_etag)
+def api_kkomantle_neighbours(request):
+    """상위 이웃 테이블: 브라우저가 하루 한 번 받아서 이 단어들은 서버 요청 없이 채점합니다."""
+    artifact = get_neighbour_artifact() if get_active_model() else None
+    if artifact is None:
+        return JsonResponse({'result': 'error', 'message': '순위표를 준비하지 못했습니다.'}, status=404)
+
+    _, body, expires_at = artifact
+    response = HttpResponse(body, content_type='application/json')
+    patch_cache_control(response, public=True, max_age=max(0, expires_at - int(time.time())))
+    return response
 
 
 # ==========================================
 # 4. 기타 뷰 함수 (블로그, 로비, 다른 게임)
 # ==========================================
 
+def wp_degraded(response):
+    """워드프레스 조회에 실패해 비어 있는 화면은 브라우저와 blog_page 캐시에 남기지 않습니다."""
+    add_never_cache_headers(response)
+    return response
+
+@blog_page
 def home(request):
     """대시보드 홈: 최근 글 3개만 요약 노출"""
     try:
         posts, _ = fetch_wp_json('posts', {'_embed': True, 'per_page': 3})
     except Exception as e:
-        print(f"Error fetching posts: {e}")
-        posts = []
+        logger.warning("WordPress 글 목록 조회 실패: %s", type(e).__name__, extra={'error': str(e)})
+        return wp_degraded(render(request, 'core/index.html', {'posts': []}))
     return render(request, 'core/index.html', {'posts': posts})
 
+@blog_page
 def blog_home(request):
     """블로그 메인: 카테고리 필터, 검색, 페이지네이션 지원"""
     page = request.GET.get('page', 1)
@@ -281,8 +680,12 @@ def blog_home(request):
         
         # 3. 카테고리 목록 가져오기
         categories, _ = fetch_wp_json('categories')
-    except Exception:
+    except Exception as e:
+        logger.warning("WordPress 블로그 목록 조회 실패: %s", type(e).__name__, extra={'error': str(e)})
         posts, categories, total_pages = [], [], 1
+        degraded = True
+    else:
+        degraded = False
 
     context = {
         'posts': posts,
@@ -293,8 +696,10 @@ def blog_home(request):
         'current_category': category_id,
         'search_query': search_query,
     }
-    return render(request, 'core/blog_home.html', context)
+    response = render(request, 'core/blog_home.html', context)
+    return wp_degraded(response) if degraded else response
 
+@blog_page
 def post_detail(request, post_id):
     post = None
     category_name = "General"
@@ -327,33 +732,42 @@ def post_detail(request, post_id):
                 next_post = next_posts[0]
 
     except Exception as e:
-        print(f"Detail view error: {e}")
+        logger.warning("WordPress 글 상세 조회 실패: %s", type(e).__name__, extra={'error': str(e)})
+        degraded = True
+    else:
+        degraded = False
 
     status_code = 404 if post is None else 200
 
-    return render(request, 'core/post_detail.html', {
+    response = render(request, 'core/post_detail.html', {
         'post': post,
         'category_name': category_name,
         'prev_post': prev_post,
         'next_post': next_post,
     }, status=status_code)
+    # 본문은 받았지만 이전/다음 글 조회에 실패한 경우도 캐시하지 않음
+    return wp_degraded(response) if degraded else response
 
+@static_page
 def roulette(request):
     return render(request, 'core/roulette.html')
 
+@static_page
 def ladder(request):
     return render(request, 'core/ladder.html')
 
+@static_page
 def games_lobby(request):
     return render(request, 'core/games/lobby.html')
 
 # --- 2048 게임 ---
+@game_page
 def game_2048(request):
     return render(request, 'core/games/2048.html')
 
+@cache_control(no_cache=True)
+@condition(etag_func=leaderboard_etag('2048'))
 def api_2048_rank(request):
-    today = timezone.now().date()
-    
     if request.method == 'POST':
         post_limit = getattr(settings, 'GAME_RANK_POST_RATE_LIMIT', 10)
         post_window = getattr(settings, 'GAME_RANK_POST_RATE_WINDOW', 60)
@@ -384,21 +798,19 @@ def api_2048_rank(request):
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
 
-    records = GameRecord.objects.filter(
-        game_type='2048', 
-        created_at__date=today
-    ).order_by('-score')[:10]
+    records = todays_records('2048').order_by('-score')[:10]
     
     data = [{'name': r.player_name, 'score': r.score} for r in records]
     return JsonResponse({'ranking': data})
 
 # --- 반응속도 게임 ---
+@game_page
 def game_reaction(request):
     return render(request, 'core/games/reaction.html')
 
+@cache_control(no_cache=True)
+@condition(etag_func=leaderboard_etag('reaction'))
 def api_reaction_rank(request):
-    today = timezone.now().date()
-    
     if request.method == 'POST':
         post_limit = getattr(settings, 'GAME_RANK_POST_RATE_LIMIT', 10)
         post_window = getattr(settings, 'GAME_RANK_POST_RATE_WINDOW', 60)
@@ -431,21 +843,19 @@ def api_reaction_rank(request):
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
 
     # 반응속도는 낮은 점수가 1등 (오름차순)
-    records = GameRecord.objects.filter(
-        game_type='reaction', 
-        created_at__date=today
-    ).order_by('score')[:10] 
+    records = todays_records('reaction').order_by('score')[:10] 
     
     data = [{'name': r.player_name, 'score': r.score} for r in records]
     return JsonResponse({'ranking': data})
 
 # --- 워들(Wordle) ---
+@game_page
 def game_wordle(request):
     return render(request, 'core/games/wordle.html')
 
+@cache_control(no_cache=True)
+@condition(etag_func=leaderboard_etag('wordle'))
 def api_wordle_rank(request):
-    today = timezone.now().date()
-    
     if request.method == 'POST':
         post_limit = getattr(settings, 'GAME_RANK_POST_RATE_LIMIT', 10)
         post_window = getattr(settings, 'GAME_RANK_POST_RATE_WINDOW', 60)
@@ -476,10 +886,7 @@ def api_wordle_rank(request):
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
 
     # 시도 횟수가 적은 게 1등
-    records = GameRecord.objects.filter(
-        game_type='wordle', 
-        created_at__date=today
-    ).order_by('score', '-created_at')[:10]
+    records = todays_records('wordle').order_by('score', '-created_at')[:10]
     
     data = [{'name': r.player_name, 'score': r.score} for r in records]
     return JsonResponse({'ranking': data})
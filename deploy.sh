@@ -7,11 +7,18 @@ BRANCH="${BRANCH:-main}"
 ENV_FILE="${ENV_FILE:-$APP_DIR/.env.production}"
 VENV_ACTIVATE="${VENV_ACTIVATE:-$APP_DIR/venv/bin/activate}"
 VENV_PYTHON="${VENV_PYTHON:-$APP_DIR/venv/bin/python}"
+APP_SERVER="${APP_SERVER:-gunicorn}"
 TMUX_SESSION="${TMUX_SESSION:-lbplate}"
 APP_START_CMD="${APP_START_CMD:-$VENV_PYTHON manage.py runserver 127.0.0.1:4000}"
+GUNICORN_BIN="${GUNICORN_BIN:-$APP_DIR/venv/bin/gunicorn}"
+GUNICORN_CONF="${GUNICORN_CONF:-$APP_DIR/config/gunicorn.conf.py}"
+GUNICORN_PIDFILE="${GUNICORN_PIDFILE:-$APP_DIR/gunicorn.pid}"
+GUNICORN_LOG="${GUNICORN_LOG:-$APP_DIR/logs/gunicorn.log}"
+GUNICORN_READY_TIMEOUT="${GUNICORN_READY_TIMEOUT:-180}"
 RUN_TESTS="${RUN_TESTS:-1}"
 PIP_INSTALL="${PIP_INSTALL:-1}"
 AUTO_STASH_SETTINGS="${AUTO_STASH_SETTINGS:-1}"
+FORCE_RESTART="${FORCE_RESTART:-0}"
 
 log() {
   printf '[deploy] %s\n' "$1"
@@ -41,8 +48,91 @@ restart_in_tmux() {
   fi
 }
 
+pid_alive() {
+  [[ -n "$1" ]] && kill -0 "$1" 2>/dev/null
+}
+
+read_pid() {
+  [[ -f "$1" ]] && tr -d '[:space:]' < "$1" || true
+}
+
+# 앱 경로(GUNICORN_APP)와 나머지 설정은 gunicorn.conf.py 가 ENV_FILE 에서 읽습니다.
+# argv 에 넣으면 USR2 재시작이 예전 값을 그대로 재사용합니다.
+start_gunicorn() {
+  mkdir -p "$(dirname "$GUNICORN_LOG")"
+  log "Starting gunicorn (${GUNICORN_APP:-config.wsgi:application})"
+  ENV_FILE="$ENV_FILE" GUNICORN_PIDFILE="$GUNICORN_PIDFILE" nohup "$GUNICORN_BIN" -c "$GUNICORN_CONF" \
+    >> "$GUNICORN_LOG" 2>&1 < /dev/null &
+  disown || true
+}
+
+# 예전 deploy.sh 로 띄운 마스터는 argv 에 앱 경로가 있어 USR2 로는 바뀌지 않으므로 한 번 완전히 재시작합니다.
+needs_full_restart() {
+  [[ "$FORCE_RESTART" == "1" ]] && return 0
+  ps -o command= -p "$1" 2>/dev/null | grep -q ':application'
+}
+
+restart_gunicorn() {
+  local old_pid="$1" waited=0
+  log "Full restart: stopping gunicorn master $old_pid (TERM); requests fail until the new master is up"
+  kill -TERM "$old_pid"
+  while pid_alive "$old_pid" && (( waited < GUNICORN_READY_TIMEOUT )); do
+    sleep 1
+    waited=$((waited + 1))
+  done
+  if pid_alive "$old_pid"; then
+    die "gunicorn master $old_pid did not stop within ${GUNICORN_READY_TIMEOUT}s"
+  fi
+  start_gunicorn
+}
+
+# USR2로 새 마스터(새 코드 + 모델 preload)를 띄우고, 새 워커가 준비되면 기존 마스터를 TERM으로
+# graceful 종료합니다. 리슨 소켓을 공유하므로 교체 중에도 요청이 끊기지 않습니다.
+reload_gunicorn() {
+  local old_pid new_pid waited
+  old_pid="$(read_pid "$GUNICORN_PIDFILE")"
+
+  if ! pid_alive "$old_pid"; then
+    start_gunicorn
+    return
+  fi
+
+  if needs_full_restart "$old_pid"; then
+    restart_gunicorn "$old_pid"
+    return
+  fi
+
+  log "Spawning new gunicorn master from pid $old_pid (USR2)"
+  kill -USR2 "$old_pid"
+
+  waited=0
+  new_pid=""
+  while (( waited < GUNICORN_READY_TIMEOUT )); do
+    new_pid="$(read_pid "$GUNICORN_PIDFILE.2")"
+    if pid_alive "$new_pid" && pgrep -P "$new_pid" >/dev/null 2>&1; then
+      break
+    fi
+    if ! pid_alive "$old_pid"; then
+      die "Old gunicorn master exited unexpectedly during reload"
+    fi
+    sleep 1
+    waited=$((waited + 1))
+  done
+
+  if ! pid_alive "$new_pid" || ! pgrep -P "$new_pid" >/dev/null 2>&1; then
+    die "New gunicorn master did not become ready within ${GUNICORN_READY_TIMEOUT}s; old master $old_pid keeps serving"
+  fi
+
+  log "New master $new_pid is serving; stopping old master $old_pid gracefully (TERM)"
+  kill -TERM "$old_pid"
+}
+
 require_cmd git
-require_cmd tmux
+if [[ "$APP_SERVER" == "gunicorn" ]]; then
+  require_cmd pgrep
+else
+  require_cmd tmux
+fi
 
 cd "$APP_DIR"
 
@@ -50,6 +140,9 @@ cd "$APP_DIR"
 [[ -f "$VENV_ACTIVATE" ]] || die "Missing venv activate file: $VENV_ACTIVATE"
 [[ -x "$VENV_PYTHON" ]] || die "Missing venv python executable: $VENV_PYTHON"
 [[ -f "$APP_DIR/manage.py" ]] || die "manage.py not found in APP_DIR: $APP_DIR"
+if [[ "$APP_SERVER" == "gunicorn" ]]; then
+  [[ -f "$GUNICORN_CONF" ]] || die "Missing gunicorn config: $GUNICORN_CONF"
+fi
 
 if [[ "$AUTO_STASH_SETTINGS" == "1" ]] && ! git diff --quiet -- config/settings.py; then
   log "Auto-stashing local changes in config/settings.py"
@@ -79,10 +172,19 @@ if [[ "$RUN_TESTS" == "1" ]]; then
   "$VENV_PYTHON" manage.py test core.tests -v 2
 fi
 
+log "Applying migrations"
+"$VENV_PYTHON" manage.py migrate --noinput
+
 log "Collecting static files"
 "$VENV_PYTHON" manage.py collectstatic --noinput
 
-restart_in_tmux
-
-log "Deployment complete."
-log "tmux attach -t $TMUX_SESSION"
+if [[ "$APP_SERVER" == "gunicorn" ]]; then
+  [[ -x "$GUNICORN_BIN" ]] || die "Missing gunicorn executable: $GUNICORN_BIN"
+  reload_gunicorn
+  log "Deployment complete."
+  log "tail -f $GUNICORN_LOG"
+else
+  restart_in_tmux
+  log "Deployment complete."
+  log "tmux attach -t $TMUX_SESSION"
+fi